@@ -0,0 +1,65 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data import dates
+from src.data.dates import parse_month_strings
+
+
+def _best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """
+    Time issue_d parsing: pd.to_datetime per row vs parse_month_strings.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-loans", type=int, default=2_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    months = pd.date_range("2007-06-01", "2018-12-01", freq="MS").strftime("%b-%Y")
+    issue_d = pd.Series(months[rng.integers(0, len(months), args.n_loans)])
+    issue_d_cat = issue_d.astype("category")
+
+    expected = pd.to_datetime(issue_d, format="%b-%Y")
+    pd.testing.assert_series_equal(
+        parse_month_strings(issue_d), expected, check_dtype=False
+    )
+
+    def cold(values):
+        dates._MONTH_TABLES.clear()
+        parse_month_strings(values)
+
+    results = {
+        "pd.to_datetime (strings)": _best_of(
+            lambda: pd.to_datetime(issue_d, format="%b-%Y"), args.repeats
+        ),
+        "parse_month_strings (strings, cold)": _best_of(
+            lambda: cold(issue_d), args.repeats
+        ),
+        "parse_month_strings (strings, warm)": _best_of(
+            lambda: parse_month_strings(issue_d), args.repeats
+        ),
+        "parse_month_strings (categorical)": _best_of(
+            lambda: parse_month_strings(issue_d_cat), args.repeats
+        ),
+    }
+
+    base = results["pd.to_datetime (strings)"]
+    print(f"Loans: {args.n_loans:,}  distinct months: {len(months)}")
+    for label, seconds in results.items():
+        print(f"  {label:<38} {seconds:7.3f}s  ({base / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
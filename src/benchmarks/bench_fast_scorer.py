@@ -0,0 +1,90 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.benchmarks.synthetic import write_synthetic_raw
+from src.data.cache import build_loan_panel
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+from src.models.baseline_pd import train_logistic_pd
+from src.models.fast_scorer import LogisticScorer
+from src.models.regime_pd import prepare_regime_features, train_regime_aware_pd
+
+
+def _best_of(fn, repeats: int):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+def main():
+    """
+    Time LogisticScorer against sklearn predict_proba on the same loans.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-loans", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loans = build_loan_panel(*write_synthetic_raw(Path(tmp), args.n_loans))
+
+    schema = FeatureSchema.fit(loans)
+    X, y = build_features(loans, schema)
+    X = schema.impute(X)
+    X_reg = prepare_regime_features(X, loans["regime"])
+
+    # Fit on a sample; only scoring speed matters here
+    fit_rows = slice(0, 50_000)
+    baseline = train_logistic_pd(X[fit_rows], y[fit_rows])
+    regime_model = train_regime_aware_pd(X_reg[fit_rows], y[fit_rows])
+
+    # sklearn needs the interaction columns built for every batch; the
+    # scorer works from the base features plus a regime code per loan
+    regime = loans["regime"]
+    stress_code = (regime == "Stress").to_numpy().astype(np.int8)
+    cases = {
+        "baseline": (
+            baseline,
+            list(X.columns),
+            lambda: baseline.predict_proba(X)[:, 1],
+            None,
+        ),
+        "regime-aware": (
+            regime_model,
+            list(X_reg.columns),
+            lambda: regime_model.predict_proba(
+                prepare_regime_features(X, regime)
+            )[:, 1],
+            stress_code,
+        ),
+    }
+
+    print(f"Loans scored: {len(X):,}")
+    for label, (model, columns, sklearn_pd, codes) in cases.items():
+        t_sk, p_sk = _best_of(sklearn_pd, args.repeats)
+        print(f"\n{label}")
+        print(f"  sklearn predict_proba          {t_sk * 1e3:8.1f} ms")
+
+        for dtype in (np.float64, np.float32):
+            scorer = LogisticScorer.from_model(model, columns, dtype=dtype)
+            X_arr = scorer.as_array(X)
+
+            t_frame, _ = _best_of(lambda: scorer.predict_pd(X, codes), args.repeats)
+            t_arr, p_fast = _best_of(lambda: scorer.predict_pd(X_arr, codes), args.repeats)
+            diff = np.abs(p_fast - p_sk).max()
+
+            name = np.dtype(dtype).name
+            print(f"  scorer {name} (DataFrame)     {t_frame * 1e3:8.1f} ms")
+            print(f"  scorer {name} (array)         {t_arr * 1e3:8.1f} ms"
+                  f"  ({t_sk / t_arr:5.1f}x, max |diff| {diff:.1e})")
+
+
+if __name__ == "__main__":
+    main()
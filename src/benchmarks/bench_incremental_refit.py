@@ -0,0 +1,114 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.benchmarks.synthetic import write_synthetic_raw
+from src.data.cache import build_loan_panel
+from src.data.dates import month_ordinal
+from src.features.build_features import build_features
+from src.features.monthly_cache import MonthlyTrainingCache
+from src.features.schema import FeatureSchema
+from src.models.baseline_pd import train_logistic_pd
+from src.models.regime_pd import train_regime_interaction_pd
+
+
+def _fit(train_fn, X, y, regime, uses_regime, **kwargs):
+    if uses_regime:
+        kwargs["regime"] = regime
+    return train_fn(X, y, **kwargs)
+
+
+def _predict(model, X, regime, uses_regime):
+    if uses_regime:
+        return model.predict_proba(X, regime=regime)[:, 1]
+    return model.predict_proba(X)[:, 1]
+
+
+def _full_retrain(panel, schema, train_fn, uses_regime, times):
+    """
+    Features for every month from the panel, then a cold fit.
+    """
+    start = time.perf_counter()
+    X, y = build_features(panel, schema)
+    X = schema.impute(X)
+    times["features"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = _fit(train_fn, X, y, panel["regime"], uses_regime)
+    times["fit"] = time.perf_counter() - start
+    return model
+
+
+def _incremental(cache, panel, train_fn, uses_regime, previous, times):
+    """
+    Features for the new month only, cached months read back, warm fit.
+    """
+    start = time.perf_counter()
+    cache.update(panel)
+    X, y, regime = cache.load()
+    times["features"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = _fit(train_fn, X, y, regime, uses_regime, warm_start_from=previous)
+    times["fit"] = time.perf_counter() - start
+    return model
+
+
+def main():
+    """
+    Refit after one new monthly vintage: full retrain (features for
+    every month, cold start) vs incremental (features for the new month
+    only, warm start from the previous model), for the baseline and the
+    regime-interaction PD models.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-loans", type=int, default=300_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        loans_path, macro_path = write_synthetic_raw(tmp, args.n_loans)
+        panel = build_loan_panel(loans_path, macro_path)
+
+        months = month_ordinal(panel["issue_month"])
+        history = panel[months < months.max()]
+        schema = FeatureSchema.fit(history)
+        new_loans = len(panel) - len(history)
+
+        cases = {
+            "baseline": (train_logistic_pd, False),
+            "regime": (train_regime_interaction_pd, True),
+        }
+
+        print(f"History: {len(history):,} loans, new vintage: {new_loans:,} loans")
+        print(f"{'':<22}{'features (s)':>14}{'fit (s)':>10}{'iterations':>12}{'total (s)':>11}")
+
+        for label, (train_fn, uses_regime) in cases.items():
+            # State before the vintage arrives: cached months, fitted model
+            cache = MonthlyTrainingCache(schema, root=tmp / f"months_{label}")
+            cache.update(history)
+            X_hist, y_hist, regime_hist = cache.load()
+            previous = _fit(train_fn, X_hist, y_hist, regime_hist, uses_regime)
+
+            full_times, incr_times = {}, {}
+            full = _full_retrain(panel, schema, train_fn, uses_regime, full_times)
+            incr = _incremental(cache, panel, train_fn, uses_regime, previous, incr_times)
+
+            for path, model, times in (("full", full, full_times),
+                                       ("incremental", incr, incr_times)):
+                print(f"{label + ' ' + path:<22}{times['features']:>14.2f}{times['fit']:>10.2f}"
+                      f"{model.n_iter_[0]:>12}{sum(times.values()):>11.2f}")
+
+            X, _, regime = cache.load()
+            diff = np.abs(
+                _predict(full, X, regime, uses_regime) - _predict(incr, X, regime, uses_regime)
+            )
+
+            print(f"{label + ' max |PD diff|':<22}{diff.max():>14.2e}")
+
+
+if __name__ == "__main__":
+    main()
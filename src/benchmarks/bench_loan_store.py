@@ -0,0 +1,93 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.benchmarks.synthetic import write_synthetic_raw
+from src.config.paths import RAW_DATA
+from src.data.cache import build_loan_panel
+from src.data.load import LENDINGCLUB_COLUMNS, load_fred_macro
+
+
+def _legacy_panel(loans_path: Path, macro_path: Path, unemployment_threshold: float = 6.0) -> pd.DataFrame:
+    """
+    The original load -> clean -> merge -> regime chain: default read
+    dtypes, raw strings kept, datetime issue dates, a DataFrame merge
+    and string regime labels.
+    """
+    df = pd.read_csv(loans_path, usecols=LENDINGCLUB_COLUMNS)
+    df["int_rate"] = pd.to_numeric(
+        df["int_rate"].astype(str).str.strip().str.rstrip("%"), errors="coerce"
+    )
+
+    df = df[df["loan_status"].isin(["Fully Paid", "Charged Off"])].copy()
+    df["default"] = (df["loan_status"] == "Charged Off").astype(int)
+    df["issue_date"] = pd.to_datetime(df["issue_d"], format="%b-%Y")
+
+    macro = load_fred_macro(macro_path)
+    df["issue_month"] = df["issue_date"].dt.to_period("M").dt.to_timestamp()
+    macro["month"] = macro["date"].dt.to_period("M").dt.to_timestamp()
+    df = df.merge(
+        macro.drop(columns=["date"]), left_on="issue_month", right_on="month", how="left"
+    ).drop(columns=["issue_month", "month"])
+
+    df["regime"] = (
+        df["unemployment_rate"] > unemployment_threshold
+    ).map({True: "Stress", False: "Expansion"})
+    return df
+
+
+def _bytes_per_loan(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes_per_loan": df.memory_usage(deep=True, index=False) / len(df),
+    })
+
+
+def main():
+    """
+    Bytes per loan of the panel: the original representation (raw
+    strings, float64/int64, datetime64 issue dates, string regimes) vs
+    the compact store built from cleaning onward (categorical codes,
+    int16 issue months, int8 default, float32 numerics).
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--loans", type=Path, default=RAW_DATA / "lendingclub.csv")
+    parser.add_argument("--macro", type=Path, default=RAW_DATA / "fred_macro.csv")
+    parser.add_argument("--n-loans", type=int, default=None,
+                        help="Use a synthetic extract of this size instead")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loans_path, macro_path = args.loans, args.macro
+        if args.n_loans is not None:
+            loans_path, macro_path = write_synthetic_raw(Path(tmp), args.n_loans)
+
+        start = time.perf_counter()
+        before = _legacy_panel(loans_path, macro_path)
+        before_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = build_loan_panel(loans_path, macro_path)
+        after_s = time.perf_counter() - start
+
+    table = _bytes_per_loan(before).join(
+        _bytes_per_loan(after), how="outer", lsuffix="_before", rsuffix="_after"
+    )
+    table = table.reindex(list(before.columns) + [c for c in after.columns if c not in before])
+    total_before = table["bytes_per_loan_before"].sum()
+    total_after = table["bytes_per_loan_after"].sum()
+
+    print(f"Loans: {len(after):,}")
+    print(table.fillna({"dtype_before": "-", "dtype_after": "-"}).round(2).to_string())
+    print(f"\n  original panel  {total_before:7.1f} bytes/loan  "
+          f"({total_before * len(before) / 1e6:,.1f} MB, built in {before_s:.2f}s)")
+    print(f"  compact panel   {total_after:7.1f} bytes/loan  "
+          f"({total_after * len(after) / 1e6:,.1f} MB, built in {after_s:.2f}s)")
+    print(f"  {total_before / total_after:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
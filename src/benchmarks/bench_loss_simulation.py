@@ -0,0 +1,47 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.benchmarks.common import PeakRSS
+from src.stress.loss_simulation import loss_summary, simulate_losses
+
+
+def main():
+    """
+    Vasicek loss simulation throughput and memory: loans x paths draws
+    in fixed float32 blocks, against the size a dense loans x paths
+    default matrix would need.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-loans", type=int, default=1_000_000)
+    parser.add_argument("--n-paths", type=int, default=10_000)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pd_hat = 1 / (1 + np.exp(-rng.normal(-2.0, 0.7, args.n_loans)))
+    exposure = rng.integers(1_000, 40_000, args.n_loans).astype(float)
+    regime = np.where(rng.random(args.n_loans) < 0.35, "Stress", "Expansion")
+
+    with PeakRSS() as mem:
+        start = time.perf_counter()
+        losses = simulate_losses(pd_hat, exposure, regime,
+                                 n_paths=args.n_paths, n_jobs=args.n_jobs)
+        seconds = time.perf_counter() - start
+
+    summary = loss_summary(losses, pd_hat, exposure, regime)
+    draws = args.n_loans * args.n_paths
+    dense_gb = draws * 4 / 1e9
+
+    print(f"Loans: {args.n_loans:,}  paths: {args.n_paths:,}")
+    print(f"  simulate_losses  {seconds:8.2f}s  ({draws / seconds / 1e6:.0f}M loan-paths/s)")
+    print(f"  peak RSS         {mem.peak_mb:8.0f} MB  "
+          f"(dense float32 loans x paths: {dense_gb:,.0f} GB)")
+    print(f"  EL {summary.loc['all', 'expected_loss']:.4e}  "
+          f"mean loss {summary.loc['all', 'mean_loss']:.4e}  "
+          f"VaR 99.9% {summary.loc['all', 'var_0.999']:.4e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.dates import ISSUE_MONTH_DTYPE, month_ordinal
+from src.data.merge_macro import merge_loans_with_macro
+
+
+def _merge_via_dataframe(loans_df: pd.DataFrame, macro_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The previous merge_loans_with_macro: Period round-trip plus hash merge
+    (on issue dates rebuilt from the int16 issue months).
+    """
+    loans_df = loans_df.copy()
+    macro_df = macro_df.copy()
+
+    issue_date = pd.Series(loans_df["issue_month"].to_numpy().astype("datetime64[M]"))
+    loans_df["month_start"] = issue_date.dt.to_period("M").dt.to_timestamp()
+    macro_df["month"] = macro_df["date"].dt.to_period("M").dt.to_timestamp()
+
+    merged = loans_df.merge(
+        macro_df.drop(columns=["date"]),
+        left_on="month_start",
+        right_on="month",
+        how="left"
+    )
+    return merged.drop(columns=["month_start", "month"])
+
+
+def main():
+    """
+    Time the month-index macro join against the DataFrame merge.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-loans", type=int, default=10_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    months = pd.date_range("2007-01-01", "2018-12-01", freq="MS")
+
+    issue_months = month_ordinal(months).astype(ISSUE_MONTH_DTYPE)
+    loans = pd.DataFrame({
+        "issue_month": issue_months[rng.integers(0, len(months), args.n_loans)],
+        "loan_amnt": rng.uniform(1_000, 40_000, args.n_loans),
+        "int_rate": rng.uniform(5, 30, args.n_loans),
+    })
+
+    macro_dates = pd.date_range("2000-01-01", "2020-12-01", freq="MS")
+    macro = pd.DataFrame({
+        "date": macro_dates,
+        "unemployment_rate": rng.uniform(3.5, 10, len(macro_dates)),
+        "fed_funds_rate": rng.uniform(0, 5, len(macro_dates)),
+    })
+
+    def best_of(fn):
+        times = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            out = fn()
+            times.append(time.perf_counter() - start)
+        return min(times), out
+
+    t_old, old = best_of(lambda: _merge_via_dataframe(loans, macro))
+    t_new, new = best_of(lambda: merge_loans_with_macro(loans, macro))
+
+    # The join attaches macro series as float32
+    pd.testing.assert_frame_equal(old, new, check_dtype=False)
+
+    print(f"Loans: {args.n_loans:,}  macro months: {len(macro)}")
+    print(f"DataFrame merge   : {t_old:7.3f}s")
+    print(f"Month-index join  : {t_new:7.3f}s  ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from sklearn.exceptions import ConvergenceWarning
+
+from src.benchmarks.common import PeakRSS
+from src.benchmarks.synthetic import write_synthetic_raw
+from src.data.cache import build_loan_panel
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+from src.models.regime_pd import (
+    REGIME_SOLVER, prepare_regime_features, train_regime_aware_pd, train_regime_interaction_pd
+)
+from src.models.solver import SolverConfig
+
+
+def main():
+    """
+    Peak RSS and time of regime-aware fit + score: materialized
+    interaction columns (sklearn) vs RegimeInteractionPD.
+
+    Both fits run the same number of L-BFGS iterations so the comparison
+    is about the design matrix, not convergence.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-loans", type=int, default=2_000_000)
+    parser.add_argument("--max-iter", type=int, default=50)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=ConvergenceWarning)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loans = build_loan_panel(*write_synthetic_raw(Path(tmp), args.n_loans))
+
+    schema = FeatureSchema.fit(loans)
+    X, y = build_features(loans, schema)
+    X = schema.impute(X)
+    regime = loans["regime"]
+
+    config = SolverConfig(solver="lbfgs", tol=REGIME_SOLVER.tol, max_iter=args.max_iter)
+
+    def materialized():
+        X_reg = prepare_regime_features(X, regime)
+        model = train_regime_aware_pd(X_reg, y, config)
+        return model.predict_proba(X_reg)[:, 1]
+
+    def implicit():
+        model = train_regime_interaction_pd(X, y, regime, config=config)
+        return model.predict_proba(X, regime)[:, 1]
+
+    print(f"Loans: {len(X):,}  base features: {X.shape[1]}")
+    for label, fn in [("materialized interactions", materialized),
+                      ("RegimeInteractionPD", implicit)]:
+        start = time.perf_counter()
+        with PeakRSS() as mem:
+            fn()
+        seconds = time.perf_counter() - start
+        print(f"  {label:<26} peak RSS +{mem.peak_mb:8.1f} MB  {seconds:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import psutil
+
+
+class PeakRSS:
+    """
+    Track peak resident set size of this process above a starting level.
+
+    A background thread samples RSS every `interval` seconds; use as a
+    context manager and read `peak_mb` afterwards.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+
+    def _rss_mb(self) -> float:
+        return self._process.memory_info().rss / 1e6
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, self._rss_mb() - self.start_mb)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.start_mb = self._rss_mb()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, self._rss_mb() - self.start_mb)
+
+
+@contextmanager
+def timed(label: str, results: dict):
+    """
+    Record wall-clock seconds of the enclosed block under results[label].
+    """
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
@@ -0,0 +1,78 @@
+import argparse
+import tempfile
+from pathlib import Path
+
+from src.benchmarks.common import PeakRSS, timed
+from src.benchmarks.synthetic import write_synthetic_raw
+from src.data.cache import build_loan_panel
+from src.data.split import time_based_split
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+from src.models import baseline_pd
+from src.pipeline.run_all import evaluate_models
+
+
+def run_stages(loans_path: Path, macro_path: Path) -> dict:
+    """
+    The data and feature stages of run_all, keeping every intermediate
+    alive the way run_all does. Returns per-stage wall-clock seconds.
+    """
+    timings = {}
+
+    with timed("panel build", timings):
+        loans_macro = build_loan_panel(loans_path, macro_path)
+
+    with timed("time split", timings):
+        train_df, test_df = time_based_split(loans_macro, train_end_date="2016-12-31")
+
+    with timed("build features", timings):
+        schema = FeatureSchema.fit(train_df)
+        X_train, y_train = build_features(train_df, schema)
+        X_test, y_test = build_features(test_df, schema)
+
+    with timed("impute (baseline)", timings):
+        X_train = schema.impute(X_train)
+        X_test = schema.impute(X_test)
+        X_train_imp = baseline_pd._mean_impute_numeric(X_train)
+        X_test_imp = baseline_pd._mean_impute_numeric(X_test)
+
+    return timings
+
+
+def main():
+    """
+    Peak RSS of the run_all pipeline on a synthetic LendingClub extract.
+
+    By default only the data and feature stages are measured, since the
+    L-BFGS fits dominate wall-clock time; pass --fit to run
+    run_all.evaluate_models end to end as well.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-loans", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fit", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loans_path, macro_path = write_synthetic_raw(
+            Path(tmp), args.n_loans, seed=args.seed
+        )
+
+        with PeakRSS() as stage_mem:
+            timings = run_stages(loans_path, macro_path)
+
+        if args.fit:
+            loans_macro = build_loan_panel(loans_path, macro_path)
+            with PeakRSS() as fit_mem, timed("evaluate_models", timings):
+                evaluate_models(loans_macro, n_boot=0)
+
+    print(f"\nLoans: {args.n_loans:,}")
+    for stage, seconds in timings.items():
+        print(f"  {stage:<20} {seconds:7.2f}s")
+    print(f"Peak RSS, data + feature stages: +{stage_mem.peak_mb:.1f} MB")
+    if args.fit:
+        print(f"Peak RSS, evaluate_models:       +{fit_mem.peak_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
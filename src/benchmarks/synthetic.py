@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Tuple
+
+
+GRADES = list("ABCDEFG")
+GRADE_SHARES = [0.20, 0.30, 0.25, 0.13, 0.07, 0.03, 0.02]
+
+
+def make_synthetic_loans(
+    n_loans: int,
+    seed: int = 0,
+    start: str = "2007-06-01",
+    end: str = "2018-12-01"
+) -> pd.DataFrame:
+    """
+    Generate raw LendingClub-shaped loans for benchmarks.
+
+    Columns and string formats follow the raw CSV (issue_d as "Mon-YYYY",
+    term as " 36 months", a share of unresolved "Current" loans), so the
+    frame can go through load/clean/merge exactly like the real file.
+    """
+    rng = np.random.default_rng(seed)
+
+    months = pd.date_range(start, end, freq="MS")
+    issue = months[rng.integers(0, len(months), n_loans)]
+
+    grade_idx = rng.choice(len(GRADES), n_loans, p=GRADE_SHARES)
+    int_rate = np.round(6 + 3 * grade_idx + rng.normal(0, 1, n_loans), 2)
+    term_60 = rng.random(n_loans) < 0.3
+    loan_amnt = rng.integers(1_000, 40_000, n_loans).astype(float)
+    annual_inc = np.round(rng.lognormal(11, 0.5, n_loans), 0)
+    dti = np.round(rng.uniform(0, 40, n_loans), 2)
+    dti[rng.random(n_loans) < 0.01] = np.nan
+
+    eta = -4.0 + 0.15 * int_rate + 0.01 * np.nan_to_num(dti) + 0.3 * term_60
+    charged_off = rng.random(n_loans) < 1 / (1 + np.exp(-eta))
+
+    status = np.where(charged_off, "Charged Off", "Fully Paid").astype(object)
+    status[rng.random(n_loans) < 0.1] = "Current"
+
+    return pd.DataFrame({
+        "loan_amnt": loan_amnt,
+        "term": np.where(term_60, " 60 months", " 36 months"),
+        "int_rate": int_rate,
+        "grade": np.asarray(GRADES)[grade_idx],
+        "annual_inc": annual_inc,
+        "issue_d": issue.strftime("%b-%Y"),
+        "loan_status": status,
+        "dti": dti,
+    })
+
+
+def make_synthetic_macro(
+    start: str = "2000-01-01",
+    end: str = "2020-12-01",
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generate a FRED-shaped monthly UNRATE series with one stress episode.
+    """
+    rng = np.random.default_rng(seed)
+
+    dates = pd.date_range(start, end, freq="MS")
+    t = np.arange(len(dates))
+    unrate = 4.5 + 5.0 * np.exp(-((t - 120) / 30.0) ** 2)
+    unrate = np.round(unrate + rng.normal(0, 0.1, len(dates)), 1)
+
+    return pd.DataFrame({
+        "observation_date": dates.strftime("%Y-%m-%d"),
+        "UNRATE": unrate,
+    })
+
+
+def write_synthetic_raw(
+    output_dir: Path,
+    n_loans: int,
+    seed: int = 0
+) -> Tuple[Path, Path]:
+    """
+    Write synthetic lendingclub.csv and fred_macro.csv into output_dir.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    loans_path = output_dir / "lendingclub.csv"
+    macro_path = output_dir / "fred_macro.csv"
+
+    make_synthetic_loans(n_loans, seed=seed).to_csv(loans_path, index=False)
+    make_synthetic_macro(seed=seed).to_csv(macro_path, index=False)
+
+    return loans_path, macro_path
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from src.config.paths import RAW_DATA, PROCESSED_DATA
+from src.data.load import load_lendingclub, load_fred_macro
+from src.data.clean import clean_lendingclub
+from src.data.merge_macro import merge_loans_with_macro
+from src.regimes.regime_labels import RegimeSpec, assign_macro_regime
+
+
+# Bump whenever a stage changes its output, so stale panels are rebuilt
+PANEL_CACHE_VERSION = 5
+
+# Rows per chunk when streaming the raw CSV into the panel
+PANEL_CHUNKSIZE = 250_000
+
+_DIGEST_INDEX = ".file_digests.json"
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Content hash of a raw input file.
+
+    Digests are remembered per (path, size, mtime) in a small index under
+    PROCESSED_DATA, so an unchanged multi-GB CSV is only hashed once.
+
+    Parameters
+    ----------
+    path : Path
+        File to fingerprint
+    chunk_size : int
+        Bytes read per block while hashing
+
+    Returns
+    -------
+    str
+        Hex digest of the file contents
+    """
+    path = Path(path).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    stat = path.stat()
+    stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    index_path = PROCESSED_DATA / _DIGEST_INDEX
+    index = {}
+    if index_path.exists():
+        index = json.loads(index_path.read_text())
+
+    entry = index.get(str(path))
+    if entry is not None and entry["stamp"] == stamp:
+        return entry["digest"]
+
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    digest = h.hexdigest()
+
+    index[str(path)] = {"stamp": stamp, "digest": digest}
+    PROCESSED_DATA.mkdir(parents=True, exist_ok=True)
+    # Per-process temp file, swapped in atomically: concurrent workers
+    # never read a half-written index (at worst one's entry is lost and
+    # the file is hashed again next time)
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(index, indent=2))
+    tmp_path.replace(index_path)
+
+    return digest
+
+
+def _short_hash(payload: dict) -> str:
+    blob = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
+
+
+def panel_cache_key(
+    loans_path: Path,
+    macro_path: Path,
+    unemployment_threshold: float,
+    extra_series: Sequence[Path] = (),
+    regime_spec: Optional[RegimeSpec] = None
+) -> str:
+    """
+    Cache key for the cleaned, macro-merged, regime-labelled loan panel.
+
+    The key has two parts: the raw inputs (file contents plus
+    PANEL_CACHE_VERSION) and the stage parameters (threshold, regime
+    spec, and the content of any extra FRED series), so panels built
+    with different settings can coexist for the same raw files.
+    """
+    data_key = _short_hash({
+        "version": PANEL_CACHE_VERSION,
+        "loans": file_digest(loans_path),
+        "macro": file_digest(macro_path),
+    })
+    param_key = _short_hash({
+        "unemployment_threshold": float(unemployment_threshold),
+        "extra_series": [file_digest(Path(p)) for p in extra_series],
+        "regime_spec": None if regime_spec is None else asdict(regime_spec),
+    })
+    return f"{data_key}_{param_key}"
+
+
+def label_panel_regimes(
+    loans: pd.DataFrame,
+    macro: pd.DataFrame,
+    unemployment_threshold: float = 6.0,
+    regime_spec: Optional[RegimeSpec] = None
+) -> pd.DataFrame:
+    """
+    Regime per loan: regime_spec labelled on the monthly macro table
+    when given, otherwise the unemployment_threshold rule.
+    """
+    if regime_spec is None:
+        return assign_macro_regime(loans, unemployment_threshold=unemployment_threshold)
+    return regime_spec.apply(loans, macro)
+
+
+def build_loan_panel(
+    loans_path: Path,
+    macro_path: Path,
+    unemployment_threshold: float = 6.0,
+    extra_series: Sequence[Path] = (),
+    regime_spec: Optional[RegimeSpec] = None
+) -> pd.DataFrame:
+    """
+    Run load -> clean -> merge -> regime on the raw files (no caching).
+
+    Every macro series (unemployment plus extra_series) is attached to
+    the loans. Regimes follow regime_spec when given, labelled on the
+    monthly macro table; otherwise the unemployment_threshold rule.
+    """
+    loans = load_lendingclub(loans_path, chunksize=PANEL_CHUNKSIZE)
+    loans = clean_lendingclub(loans)
+
+    macro = load_fred_macro(macro_path, extra_series)
+    loans = merge_loans_with_macro(loans, macro)
+    return label_panel_regimes(loans, macro, unemployment_threshold, regime_spec)
+
+
+def panel_cache_path(
+    loans_path: Path,
+    macro_path: Path,
+    unemployment_threshold: float = 6.0,
+    extra_series: Sequence[Path] = (),
+    regime_spec: Optional[RegimeSpec] = None
+) -> Path:
+    """
+    Where load_loan_panel stores the panel for these inputs and settings.
+    """
+    key = panel_cache_key(
+        loans_path, macro_path, unemployment_threshold, extra_series, regime_spec
+    )
+    return PROCESSED_DATA / f"loan_panel_{key}.parquet"
+
+
+def save_loan_panel(loans: pd.DataFrame, cache_path: Path):
+    """
+    Write a panel to its cache path atomically, then drop panels built
+    from older raw inputs.
+    """
+    PROCESSED_DATA.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".parquet.tmp")
+    loans.to_parquet(tmp_path, index=False)
+    tmp_path.replace(cache_path)
+
+    data_key = cache_path.stem[len("loan_panel_"):].split("_")[0]
+    for stale in PROCESSED_DATA.glob("loan_panel_*.parquet"):
+        if not stale.name.startswith(f"loan_panel_{data_key}_"):
+            stale.unlink()
+
+    print(f"Loan panel cached: {cache_path.name}")
+
+
+def load_loan_panel(
+    loans_path: Path = RAW_DATA / "lendingclub.csv",
+    macro_path: Path = RAW_DATA / "fred_macro.csv",
+    unemployment_threshold: float = 6.0,
+    extra_series: Sequence[Path] = (),
+    regime_spec: Optional[RegimeSpec] = None,
+    use_cache: bool = True
+) -> pd.DataFrame:
+    """
+    Load the cleaned, macro-merged loan panel through a Parquet cache.
+
+    The panel is stored under PROCESSED_DATA with a name derived from the
+    content of both raw files and the stage parameters. Any change to
+    either input, the regime threshold or spec, or an extra series
+    produces a new key; panels built from older raw inputs are removed
+    when the new one is saved.
+
+    Parameters
+    ----------
+    loans_path : Path
+        Raw LendingClub CSV
+    macro_path : Path
+        FRED macro CSV
+    unemployment_threshold : float
+        Threshold passed to assign_macro_regime
+    extra_series : sequence of Path
+        Further FRED downloads attached as macro columns (load_fred_macro)
+    regime_spec : RegimeSpec, optional
+        N-state regimes to use instead of the threshold rule
+    use_cache : bool
+        If False, always rebuild from the raw files and skip writing
+
+    Returns
+    -------
+    pd.DataFrame
+        Loan panel with default, issue_month, macro columns and regime
+    """
+    settings = dict(
+        unemployment_threshold=unemployment_threshold,
+        extra_series=tuple(extra_series),
+        regime_spec=regime_spec,
+    )
+    if not use_cache:
+        return build_loan_panel(loans_path, macro_path, **settings)
+
+    cache_path = panel_cache_path(loans_path, macro_path, **settings)
+    if cache_path.exists():
+        print(f"Loan panel cache hit: {cache_path.name}")
+        return pd.read_parquet(cache_path, memory_map=True)
+
+    loans = build_loan_panel(loans_path, macro_path, **settings)
+    save_loan_panel(loans, cache_path)
+    return loans
@@ -1,5 +1,12 @@
+import numpy as np
 import pandas as pd
 
+from src.data.dates import parse_issue_months
+
+
+# Raw string columns with no use once the target and issue month exist
+RAW_STRING_COLUMNS = ["loan_status", "issue_d"]
+
 
 def clean_lendingclub(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -13,17 +20,16 @@ def clean_lendingclub(df: pd.DataFrame) -> pd.DataFrame:
     Returns
     -------
     pd.DataFrame
-        Cleaned data with default indicator
+        Cleaned data (the input is not modified): the raw loan_status
+        and issue_d strings are replaced by an int8 default indicator
+        and an int16 issue_month ordinal (see src.data.dates)
     """
-    df = df.copy()
-
     # Keep loans with known outcomes
     df = df[df["loan_status"].isin(["Fully Paid", "Charged Off"])]
 
-    # Binary default target
-    df["default"] = (df["loan_status"] == "Charged Off").astype(int)
-
-    # Parse issue date (for time-aware splits)
-    df["issue_date"] = pd.to_datetime(df["issue_d"], format="%b-%Y")
-
-    return df
+    return df.drop(columns=RAW_STRING_COLUMNS).assign(
+        # Binary default target
+        default=(df["loan_status"] == "Charged Off").to_numpy(dtype=np.int8),
+        # Issue month (for time-aware splits), parsed once per distinct month
+        issue_month=parse_issue_months(df["issue_d"], format="%b-%Y"),
+    )
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from pandas.api.extensions import take
+
+
+# Sentinel ordinal for missing dates (never matches a macro month)
+NAT_MONTH = np.iinfo(np.int32).min
+
+# Loan panels store issue months as int16 ordinals (months since
+# 1970-01, enough up to the year 4700), with their own missing sentinel
+ISSUE_MONTH_DTYPE = np.int16
+NAT_ISSUE_MONTH = np.iinfo(np.int16).min
+
+# Parsed value per (format, errors) and distinct month string, shared by
+# every caller in the process
+_MONTH_TABLES = {}
+
+
+def _lookup_months(
+    uniques: pd.Index,
+    format: str,
+    errors: str
+) -> np.ndarray:
+    """
+    Parse distinct strings through the shared lookup table.
+    """
+    table = _MONTH_TABLES.setdefault((format, errors), {})
+
+    missing = [u for u in uniques if u not in table]
+    if missing:
+        parsed = pd.to_datetime(pd.Index(missing), format=format, errors=errors)
+        table.update(zip(missing, parsed.to_numpy().astype("datetime64[ns]")))
+
+    return np.array([table[u] for u in uniques], dtype="datetime64[ns]")
+
+
+def _month_codes(values: pd.Series):
+    """
+    Integer codes and distinct values: the categorical codes when values
+    is categorical, otherwise from pd.factorize.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
+
+
+def parse_month_strings(
+    values: pd.Series,
+    format: str = "%b-%Y",
+    errors: str = "raise"
+) -> pd.Series:
+    """
+    Parse month strings such as LendingClub's issue_d ("Dec-2015").
+
+    A panel of millions of loans holds only a few hundred distinct month
+    strings, so each distinct value is parsed once (and remembered for
+    later calls) and the result is broadcast back through integer codes:
+    the categorical codes when values is categorical, otherwise codes
+    from pd.factorize.
+
+    Parameters
+    ----------
+    values : pd.Series
+        Month strings, object/string or categorical dtype
+    format : str
+        strptime format of the strings
+    errors : str
+        "raise" or "coerce", as in pd.to_datetime
+
+    Returns
+    -------
+    pd.Series
+        datetime64[ns] values aligned to values.index; missing -> NaT
+    """
+    codes, uniques = _month_codes(values)
+
+    parsed = _lookup_months(uniques, format, errors)
+    dates = take(parsed, codes, allow_fill=True, fill_value=np.datetime64("NaT"))
+
+    return pd.Series(dates, index=values.index, name=values.name)
+
+
+def parse_issue_months(
+    values: pd.Series,
+    format: str = "%b-%Y",
+    errors: str = "raise"
+) -> pd.Series:
+    """
+    Parse month strings straight to int16 month ordinals.
+
+    Same lookup as parse_month_strings, but the few hundred distinct
+    months are converted to ordinals before broadcasting, so no
+    datetime64 column is ever built at loan level.
+
+    Returns
+    -------
+    pd.Series
+        ISSUE_MONTH_DTYPE ordinals aligned to values.index; missing ->
+        NAT_ISSUE_MONTH
+    """
+    codes, uniques = _month_codes(values)
+
+    ordinals = month_ordinal(_lookup_months(uniques, format, errors))
+    months = np.where(ordinals == NAT_MONTH, NAT_ISSUE_MONTH, ordinals)
+    months = take(months.astype(ISSUE_MONTH_DTYPE), codes,
+                  allow_fill=True, fill_value=NAT_ISSUE_MONTH)
+
+    return pd.Series(months, index=values.index, name="issue_month")
+
+
+def month_ordinal(dates) -> np.ndarray:
+    """
+    Integer month index (months since 1970-01) for an array of dates.
+
+    Parameters
+    ----------
+    dates : array-like
+        Datetimes (or strings parseable by pd.to_datetime), or integer
+        month ordinals such as a panel's int16 issue_month
+
+    Returns
+    -------
+    np.ndarray
+        int32 month ordinals; NaT (or NAT_ISSUE_MONTH) maps to NAT_MONTH
+    """
+    values = np.asarray(dates)
+    if np.issubdtype(values.dtype, np.integer):
+        ordinals = values.astype(np.int32)
+        ordinals[values == NAT_ISSUE_MONTH] = NAT_MONTH
+        return ordinals
+
+    values = np.asarray(pd.to_datetime(dates))
+
+    # Calendar conversion is slow per element, so convert the few distinct
+    # dates once and broadcast through the factorized codes
+    codes, uniques = pd.factorize(values.view(np.int64))
+    months = uniques.view(values.dtype).astype("datetime64[M]")
+
+    ordinals = months.astype(np.int64)
+    ordinals[np.isnat(months)] = NAT_MONTH
+    return ordinals.astype(np.int32)[codes]
+
+
+def month_end(ordinals) -> pd.DatetimeIndex:
+    """
+    Month-end timestamps of month ordinals.
+    """
+    months = np.asarray(ordinals, dtype="int64").astype("datetime64[M]")
+    return pd.DatetimeIndex(months) + pd.offsets.MonthEnd(0)
+
+
+def month_labels(months) -> pd.Series:
+    """
+    "YYYY-MM" label per month, as a categorical built once per distinct
+    month; missing months get no label.
+    """
+    index = months.index if isinstance(months, pd.Series) else None
+
+    codes, uniques = pd.factorize(month_ordinal(months), sort=True)
+    if len(uniques) and uniques[0] == NAT_MONTH:
+        # The sentinel sorts first
+        codes, uniques = codes - 1, uniques[1:]
+    labels = uniques.astype(np.int64).astype("datetime64[M]").astype(str)
+
+    return pd.Series(pd.Categorical.from_codes(codes, labels), index=index)
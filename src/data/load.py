@@ -1,28 +1,155 @@
 import pandas as pd
 from pathlib import Path
+from typing import Iterator, Optional, Sequence
 
+from pandas.api.types import union_categoricals
 
-def load_lendingclub(path: Path) -> pd.DataFrame:
+
+LENDINGCLUB_COLUMNS = [
+    "loan_status",
+    "issue_d",
+    "loan_amnt",
+    "int_rate",
+    "annual_inc",
+    "dti",
+    "grade",
+    "term"
+]
+
+# Loan outcomes kept by clean_lendingclub
+KNOWN_OUTCOMES = ["Fully Paid", "Charged Off"]
+
+# Explicit read dtypes for the streaming path. int_rate is left to the
+# parser because some extracts store it as "13.56%" and others as 13.56.
+_CATEGORICAL_COLUMNS = ["loan_status", "issue_d", "grade", "term"]
+_FLOAT_COLUMNS = ["loan_amnt", "int_rate", "annual_inc", "dti"]
+_READ_DTYPES = {
+    "loan_status": "category",
+    "issue_d": "category",
+    "grade": "category",
+    "term": "category",
+    "loan_amnt": "float32",
+    "annual_inc": "float32",
+    "dti": "float32",
+}
+
+
+def _parse_percent(s: pd.Series) -> pd.Series:
+    """
+    Parse a percentage column ("13.56%" or 13.56) to float32.
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype("float32")
+
+    s = s.astype(str).str.strip().str.rstrip("%")
+    return pd.to_numeric(s, errors="coerce").astype("float32")
+
+
+def _compact_chunk(
+    chunk: pd.DataFrame,
+    statuses: Optional[Sequence[str]]
+) -> pd.DataFrame:
+    """
+    Filter a raw chunk to known outcomes and downcast to compact dtypes.
+    """
+    if statuses is not None:
+        chunk = chunk[chunk["loan_status"].isin(statuses)]
+
+    chunk = chunk.assign(int_rate=_parse_percent(chunk["int_rate"]))
+
+    for col in _CATEGORICAL_COLUMNS:
+        chunk[col] = chunk[col].cat.remove_unused_categories()
+
+    return chunk
+
+
+def iter_lendingclub_chunks(
+    path: Path,
+    chunksize: int = 250_000,
+    statuses: Optional[Sequence[str]] = KNOWN_OUTCOMES
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream LendingClub data in compact, typed chunks.
+
+    Parameters
+    ----------
+    path : Path
+        Raw LendingClub CSV
+    chunksize : int
+        Rows parsed per chunk; peak memory scales with this, not file size
+    statuses : sequence of str or None
+        loan_status values to keep while reading (None keeps every row)
+
+    Yields
+    ------
+    pd.DataFrame
+        Chunk with categorical loan_status/issue_d/grade/term and
+        float32 numerics (int_rate parsed from percent strings)
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    reader = pd.read_csv(
+        path,
+        usecols=LENDINGCLUB_COLUMNS,
+        dtype=_READ_DTYPES,
+        chunksize=chunksize
+    )
+
+    with reader:
+        for chunk in reader:
+            yield _compact_chunk(chunk, statuses)
+
+
+def concat_compact_chunks(chunks: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate compact chunks, unifying categories so no column falls
+    back to object dtype.
+    """
+    chunks = list(chunks)
+    if not chunks:
+        raise ValueError("No chunks to concatenate")
+
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [c[col] for c in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            merged = union_categoricals(parts, sort_categories=True)
+            columns[col] = pd.Series(merged)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+
+    return pd.DataFrame(columns)
+
+
+def load_lendingclub(
+    path: Path,
+    chunksize: Optional[int] = None,
+    statuses: Optional[Sequence[str]] = KNOWN_OUTCOMES
+) -> pd.DataFrame:
     """
     Load LendingClub loan-level data efficiently.
+
+    With chunksize=None the whole file is parsed in one pass with inferred
+    dtypes. Passing a chunksize switches to the streaming reader
+    (iter_lendingclub_chunks): rows are filtered to statuses during the
+    read and stored with categorical and float32 dtypes, so peak memory is
+    bounded by the chunk size plus the compact result. statuses only
+    applies to the streaming reader; the one-pass load keeps every row.
     """
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    usecols = [
-        "loan_status",
-        "issue_d",
-        "loan_amnt",
-        "int_rate",
-        "annual_inc",
-        "dti",
-        "grade",
-        "term"
-    ]
+    if chunksize is not None:
+        df = concat_compact_chunks(
+            iter_lendingclub_chunks(path, chunksize=chunksize, statuses=statuses)
+        )
+        print("CSV load complete (streamed)")
+        return df
 
     df = pd.read_csv(
         path,
-        usecols=usecols,
+        usecols=LENDINGCLUB_COLUMNS,
         low_memory=False
     )
 
@@ -30,9 +157,31 @@ def load_lendingclub(path: Path) -> pd.DataFrame:
     return df
 
 
-def load_fred_macro(path: Path) -> pd.DataFrame:
+# FRED series ID -> column name in the macro table; other IDs are
+# lower-cased
+FRED_SERIES = {
+    "UNRATE": "unemployment_rate",
+    "A191RL1Q225SBEA": "gdp_growth",
+    "FEDFUNDS": "fed_funds_rate",
+    "DFF": "fed_funds_rate",
+    "CSUSHPINSA": "hpi",
+    "USSTHPI": "hpi",
+}
+
+
+def load_fred_series(path: Path) -> pd.DataFrame:
     """
-    Load and clean FRED macroeconomic data (robust to schema).
+    Load one FRED CSV download and resample it to monthly.
+
+    Every non-date column is read as a series (FRED's "." missing marker
+    becomes NaN) and named through FRED_SERIES. Daily and weekly series
+    are averaged within each month; quarterly and annual series are
+    carried forward into the months until their next observation.
+
+    Returns
+    -------
+    pd.DataFrame
+        date (first day of each month) plus one column per series
     """
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
@@ -52,19 +201,48 @@ def load_fred_macro(path: Path) -> pd.DataFrame:
     if date_col is None:
         raise ValueError(f"No date column found. Columns: {df.columns.tolist()}")
 
+    values = df.drop(columns=date_col).apply(pd.to_numeric, errors="coerce")
+    values.index = pd.to_datetime(df[date_col])
+    values = values.rename(columns=lambda c: FRED_SERIES.get(c, c.lower()))
+
+    values = values.sort_index()
+    monthly = values.resample("MS").mean()
+    for col in monthly.columns:
+        observed = values[col].dropna().index.to_series()
+        if observed.diff().median() > pd.Timedelta(days=31):
+            monthly[col] = monthly[col].ffill()
+
+    return monthly.rename_axis("date").reset_index()
+
+
+def load_fred_macro(
+    path: Path,
+    extra_series: Sequence[Path] = ()
+) -> pd.DataFrame:
+    """
+    Load and clean FRED macroeconomic data (robust to schema).
+
+    path must hold UNRATE; extra_series are further FRED downloads
+    (GDP growth, Fed funds, HPI, ...) at any frequency. All series are
+    resampled to monthly (load_fred_series) and joined on the month.
+
+    Returns
+    -------
+    pd.DataFrame
+        date, unemployment_rate and one column per extra series, one row
+        per month covered by any series
+    """
+    macro = load_fred_series(path)
+
     # Detect unemployment column
-    if "UNRATE" not in df.columns:
-        raise ValueError(f"No UNRATE column found. Columns: {df.columns.tolist()}")
-
-    # Standardize names
-    df = df.rename(
-        columns={
-            date_col: "date",
-            "UNRATE": "unemployment_rate"
-        }
-    )
+    if "unemployment_rate" not in macro.columns:
+        raise ValueError(f"No UNRATE column found. Columns: {macro.columns.tolist()}")
 
-    # Parse datetime
-    df["date"] = pd.to_datetime(df["date"])
+    for extra in extra_series:
+        series = load_fred_series(Path(extra))
+        overlap = set(series.columns) & set(macro.columns) - {"date"}
+        if overlap:
+            raise ValueError(f"Series {sorted(overlap)} in {extra} already loaded")
+        macro = macro.merge(series, on="date", how="outer")
 
-    return df
+    return macro.sort_values("date", ignore_index=True)
@@ -1,43 +1,122 @@
+import numpy as np
 import pandas as pd
+from typing import Optional, Sequence
+
+from pandas.api.extensions import take
+
+from src.data.dates import NAT_MONTH, month_ordinal
+
+
+def macro_row_index(
+    loan_months: np.ndarray,
+    macro_months: np.ndarray,
+    asof: bool = False
+) -> np.ndarray:
+    """
+    Map loan month ordinals to rows of a sorted monthly macro table.
+
+    A lookup table is built once over the span of loan months (a few
+    hundred entries) with np.searchsorted, then broadcast to every loan
+    with a single gather, so the cost per loan is one array take.
+
+    Parameters
+    ----------
+    loan_months : np.ndarray
+        Month ordinal per loan
+    macro_months : np.ndarray
+        Sorted, unique month ordinals of the macro table
+    asof : bool
+        If True, a loan month without a macro row takes the latest
+        earlier row; otherwise it gets no match
+
+    Returns
+    -------
+    np.ndarray
+        Macro row position per loan, -1 where there is no match
+    """
+    rows = np.full(len(loan_months), -1, dtype=np.int64)
+
+    valid = loan_months != NAT_MONTH
+    if not valid.any() or len(macro_months) == 0:
+        return rows
+
+    lo = loan_months[valid].min()
+    hi = loan_months[valid].max()
+    span = np.arange(lo, hi + 1)
+
+    # Latest macro row at or before each month in the span
+    table = np.searchsorted(macro_months, span, side="right") - 1
+    if not asof:
+        exact = (table >= 0) & (macro_months[np.maximum(table, 0)] == span)
+        table = np.where(exact, table, -1)
+
+    rows[valid] = table[loan_months[valid] - lo]
+    return rows
 
 
 def merge_loans_with_macro(
     loans_df: pd.DataFrame,
-    macro_df: pd.DataFrame
+    macro_df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    lag_months: int = 0,
+    asof: bool = False
 ) -> pd.DataFrame:
     """
     Merge loan-level data with macroeconomic indicators.
 
+    Loans are matched to macro rows by integer month index rather than a
+    DataFrame merge: the loan frame is not rebuilt, macro columns are
+    gathered with one take each and added alongside the existing columns.
+    Floating macro series are attached as float32, like the loan
+    numerics; the monthly table itself keeps float64.
+
     Parameters
     ----------
     loans_df : pd.DataFrame
-        Cleaned LendingClub data with issue_date
+        Cleaned LendingClub data with issue_month
     macro_df : pd.DataFrame
-        Macro data with date column
+        Monthly macro data with date column (one row per month; if a
+        month repeats, its last row is used)
+    columns : sequence of str, optional
+        Macro series to attach; defaults to every column except date
+    lag_months : int
+        Attach the macro value from this many months before issue
+    asof : bool
+        Fall back to the latest earlier macro month when the exact month
+        is missing, instead of leaving NaN
 
     Returns
     -------
     pd.DataFrame
-        Loan data enriched with macro variables
+        Loan data enriched with macro variables (inputs are not modified)
     """
-    loans_df = loans_df.copy()
-    macro_df = macro_df.copy()
+    if columns is None:
+        columns = [c for c in macro_df.columns if c != "date"]
+
+    macro_months = month_ordinal(macro_df["date"])
+    order = np.argsort(macro_months, kind="stable")
+    macro_months = macro_months[order]
 
-    # Ensure datetime
-    loans_df["issue_date"] = pd.to_datetime(loans_df["issue_date"])
-    macro_df["date"] = pd.to_datetime(macro_df["date"])
+    # Keep the last row of any repeated month
+    last = np.r_[macro_months[1:] != macro_months[:-1], True]
+    macro_months = macro_months[last]
+    order = order[last]
 
-    # Align by month
-    loans_df["issue_month"] = loans_df["issue_date"].dt.to_period("M").dt.to_timestamp()
-    macro_df["month"] = macro_df["date"].dt.to_period("M").dt.to_timestamp()
+    loan_months = month_ordinal(loans_df["issue_month"])
+    if lag_months:
+        loan_months = np.where(
+            loan_months != NAT_MONTH, loan_months - lag_months, NAT_MONTH
+        ).astype(np.int32)
+    rows = macro_row_index(loan_months, macro_months, asof=asof)
 
-    merged = loans_df.merge(
-        macro_df.drop(columns=["date"]),
-        left_on="issue_month",
-        right_on="month",
-        how="left"
-    )
+    # Compose loan -> sorted macro row -> original macro row
+    rows = np.where(rows >= 0, order[np.maximum(rows, 0)], -1)
 
-    merged = merged.drop(columns=["issue_month", "month"])
+    new_cols = {}
+    for col in columns:
+        values = macro_df[col].to_numpy()
+        if values.dtype.kind == "f":
+            values = values.astype(np.float32)
+        new_cols[col] = take(values, rows, allow_fill=True)
 
-    return merged
+    return loans_df.assign(**new_cols)
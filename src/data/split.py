@@ -1,28 +1,42 @@
+import numpy as np
 import pandas as pd
 from typing import Tuple
 
+from src.data.dates import NAT_MONTH, month_ordinal
+
+
+def issued_through(df: pd.DataFrame, end_date: str) -> np.ndarray:
+    """
+    Mask of loans issued in or before the month of end_date (undated
+    loans excluded).
+    """
+    months = month_ordinal(df["issue_month"])
+    return (months != NAT_MONTH) & (months <= month_ordinal([end_date])[0])
+
 
 def time_based_split(
     df: pd.DataFrame,
     train_end_date: str
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Split data into train/test based on issue_date.
+    Split data into train/test based on issue month.
 
     Parameters
     ----------
     df : pd.DataFrame
         Cleaned LendingClub data
     train_end_date : str
-        Last date for training data (YYYY-MM-DD)
+        Last date for training data (YYYY-MM-DD); loans issued in its
+        month are training data, undated loans fall in neither part
 
     Returns
     -------
     train_df, test_df : pd.DataFrame
     """
-    df = df.copy()
+    train = issued_through(df, train_end_date)
+    test = month_ordinal(df["issue_month"]) > month_ordinal([train_end_date])[0]
 
-    train_df = df[df["issue_date"] <= train_end_date]
-    test_df = df[df["issue_date"] > train_end_date]
+    train_df = df[train]
+    test_df = df[test]
 
     return train_df, test_df
@@ -1,9 +1,12 @@
 import pandas as pd
-from typing import Tuple
+from typing import Optional, Tuple
+
+from src.features.schema import CAT_FEATURES, NUM_FEATURES, FeatureSchema
 
 
 def build_features(
-    df: pd.DataFrame
+    df: pd.DataFrame,
+    schema: Optional[FeatureSchema] = None
 ) -> Tuple[pd.DataFrame, pd.Series]:
     """
     Build feature matrix X and target y for PD modeling.
@@ -12,6 +15,9 @@ def build_features(
     ----------
     df : pd.DataFrame
         Cleaned LendingClub data
+    schema : FeatureSchema, optional
+        Frozen layout from training data. Without it, dummy columns
+        depend on the levels present in df.
 
     Returns
     -------
@@ -20,27 +26,14 @@ def build_features(
     y : pd.Series
         Default target
     """
-    df = df.copy()
-
     # Target
     y = df["default"]
 
-    # Select numerical features
-    num_features = [
-        "loan_amnt",
-        "int_rate",
-        "annual_inc",
-        "dti"
-    ]
-
-    # Select categorical features
-    cat_features = [
-        "grade",
-        "term"
-    ]
-
-    X_num = df[num_features]
-    X_cat = pd.get_dummies(df[cat_features], drop_first=True)
+    if schema is not None:
+        return schema.transform(df), y
+
+    X_num = df[NUM_FEATURES]
+    X_cat = pd.get_dummies(df[CAT_FEATURES], drop_first=True)
 
     X = pd.concat([X_num, X_cat], axis=1)
 
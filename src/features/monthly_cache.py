@@ -0,0 +1,135 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.config.paths import PROCESSED_DATA
+from src.data.dates import NAT_MONTH, month_ordinal
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+
+
+TRAINING_CACHE_DIR = PROCESSED_DATA / "training_months"
+
+# Panel columns a cached month depends on
+_SOURCE_COLUMNS = [
+    "loan_amnt", "int_rate", "annual_inc", "dti", "grade", "term",
+    "default", "regime",
+]
+
+_MANIFEST = "manifest.json"
+
+
+def _schema_key(schema: FeatureSchema) -> str:
+    blob = json.dumps({
+        "columns": schema.columns,
+        "impute_means": schema.impute_means,
+    }, sort_keys=True).encode()
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
+
+
+def _month_label(ordinal: int) -> str:
+    return str(np.datetime64(int(ordinal), "M"))
+
+
+class MonthlyTrainingCache:
+    """
+    Imputed training matrix stored as one Parquet file per issue month.
+
+    Features are built with a frozen schema, so a month's rows never
+    change once written unless the month's source rows do. update()
+    hashes each month of the panel (order-insensitive sum of row
+    hashes) and only builds features for new or restated months;
+    load() concatenates the cached months. A different schema gets a
+    separate directory.
+    """
+
+    def __init__(self, schema: FeatureSchema, root: Path = TRAINING_CACHE_DIR):
+        self.schema = schema
+        self.dir = Path(root) / _schema_key(schema)
+
+    def _manifest(self) -> dict:
+        path = self.dir / _MANIFEST
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def _month_path(self, label: str) -> Path:
+        return self.dir / f"month_{label}.parquet"
+
+    def months(self) -> List[str]:
+        return sorted(self._manifest())
+
+    def update(self, panel: pd.DataFrame) -> List[str]:
+        """
+        Cache features for every month of panel not already cached with
+        identical source rows, and drop cached months no longer in
+        panel. Returns the months (YYYY-MM) written.
+        """
+        ordinals = month_ordinal(panel["issue_month"])
+        dated = ordinals != NAT_MONTH
+
+        row_hash = pd.util.hash_pandas_object(panel[_SOURCE_COLUMNS], index=False)
+        digests = row_hash[dated].groupby(ordinals[dated]).agg(["sum", "size"])
+
+        manifest = self._manifest()
+        written = []
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        present = {_month_label(ordinal) for ordinal in digests.index}
+        stale = sorted(set(manifest) - present)
+        for label in stale:
+            del manifest[label]
+
+        for ordinal, (digest, rows) in digests.iterrows():
+            label = _month_label(ordinal)
+            entry = {"digest": f"{int(digest):016x}", "rows": int(rows)}
+            if manifest.get(label) == entry and self._month_path(label).exists():
+                continue
+
+            month = panel[ordinals == ordinal]
+            X, y = build_features(month, self.schema)
+            block = self.schema.impute(X).assign(
+                default=y.to_numpy(), regime=month["regime"].to_numpy()
+            )
+            path = self._month_path(label)
+            tmp_path = path.with_suffix(".parquet.tmp")
+            block.to_parquet(tmp_path, index=False)
+            tmp_path.replace(path)
+
+            manifest[label] = entry
+            written.append(label)
+
+        # Manifest last, so an interrupted update only rebuilds its months
+        tmp_path = self.dir / f"{_MANIFEST}.tmp"
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        tmp_path.replace(self.dir / _MANIFEST)
+
+        # Files of dropped months go after the manifest stops listing them
+        for label in stale:
+            self._month_path(label).unlink(missing_ok=True)
+        return written
+
+    def load(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
+        """
+        Cached months in [start, end] (YYYY-MM, inclusive) as X, y, regime.
+        """
+        labels = [
+            m for m in self.months()
+            if (start is None or m >= start) and (end is None or m <= end)
+        ]
+        if not labels:
+            raise ValueError(f"No cached training months in [{start}, {end}]")
+
+        # One multi-file read is several times faster than per-file concat
+        block = pq.ParquetDataset(
+            [str(self._month_path(m)) for m in labels]
+        ).read().to_pandas()
+        X = block[self.schema.columns]
+        return X, block["default"], block["regime"]
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+# Raw columns used as model features
+NUM_FEATURES = [
+    "loan_amnt",
+    "int_rate",
+    "annual_inc",
+    "dti"
+]
+
+CAT_FEATURES = [
+    "grade",
+    "term"
+]
+
+
+@dataclass
+class FeatureSchema:
+    """
+    Frozen feature layout learned from training data.
+
+    pd.get_dummies(drop_first=True) produces whichever dummy columns the
+    levels present in a batch allow, so two batches can disagree. The
+    schema fixes the category levels, the output column order and the
+    training imputation means, so every batch maps to the same matrix.
+    """
+    num_features: List[str]
+    cat_levels: Dict[str, List[str]]
+    impute_means: Dict[str, float]
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame) -> "FeatureSchema":
+        """
+        Learn levels and means from a training frame.
+        """
+        cat_levels = {}
+        for col in CAT_FEATURES:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                levels = values.cat.remove_unused_categories().cat.categories
+            else:
+                levels = pd.Index(values.dropna().unique()).sort_values()
+            cat_levels[col] = [str(level) for level in levels]
+
+        impute_means = {
+            col: float(df[col].mean()) for col in NUM_FEATURES
+        }
+
+        return cls(
+            num_features=list(NUM_FEATURES),
+            cat_levels=cat_levels,
+            impute_means=impute_means,
+        )
+
+    @classmethod
+    def fit_chunks(cls, chunks: Iterable[pd.DataFrame]) -> "FeatureSchema":
+        """
+        Learn levels and means from training data streamed in chunks.
+
+        Gives the same schema as fit() on the concatenated chunks while
+        holding one chunk at a time: levels are unioned and sorted,
+        means come from running sums and counts.
+        """
+        levels = {col: set() for col in CAT_FEATURES}
+        sums = dict.fromkeys(NUM_FEATURES, 0.0)
+        counts = dict.fromkeys(NUM_FEATURES, 0)
+
+        for df in chunks:
+            for col in CAT_FEATURES:
+                levels[col].update(str(v) for v in df[col].dropna().unique())
+            for col in NUM_FEATURES:
+                values = df[col].to_numpy(dtype=np.float64)
+                observed = ~np.isnan(values)
+                sums[col] += values[observed].sum()
+                counts[col] += int(observed.sum())
+
+        return cls(
+            num_features=list(NUM_FEATURES),
+            cat_levels={col: sorted(levels[col]) for col in CAT_FEATURES},
+            impute_means={
+                col: sums[col] / counts[col] if counts[col] else float("nan")
+                for col in NUM_FEATURES
+            },
+        )
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Output column order: numerics, then one dummy per non-base level.
+        """
+        dummies = [
+            f"{col}_{level}"
+            for col, levels in self.cat_levels.items()
+            for level in levels[1:]
+        ]
+        return self.num_features + dummies
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the feature matrix in schema order (numerics not imputed).
+
+        Levels unseen in training map to the base level (all dummies 0),
+        matching drop_first encoding.
+        """
+        X = {col: df[col] for col in self.num_features}
+
+        for col, levels in self.cat_levels.items():
+            for level in levels[1:]:
+                X[f"{col}_{level}"] = (df[col] == level).to_numpy()
+
+        return pd.DataFrame(X, index=df.index)[self.columns]
+
+    def impute(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill missing numerics with the training means.
+        """
+        fill = {
+            col: mean for col, mean in self.impute_means.items()
+            if col in X.columns and X[col].isna().any()
+        }
+        if not fill:
+            return X
+        return X.fillna(fill)
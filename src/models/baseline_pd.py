@@ -1,34 +1,46 @@
+from typing import Optional
+
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import roc_auc_score
+
+from src.models.metrics import rank_auc
+from src.models.solver import SolverConfig, fit_logistic
+
+
+BASELINE_SOLVER = SolverConfig(solver="newton-cholesky")
 
 
 def _mean_impute_numeric(X: pd.DataFrame) -> pd.DataFrame:
     """
     Mean-impute only numeric columns.
+
+    Only columns that contain NaNs are rewritten; the rest stay shared
+    with X under copy-on-write, and X itself is not modified.
     """
-    X = X.copy()
     num_cols = X.select_dtypes(include=["number"]).columns
-    X[num_cols] = X[num_cols].fillna(X[num_cols].mean())
-    return X
+    missing = [c for c in num_cols if X[c].isna().any()]
+    if not missing:
+        return X
+    return X.fillna(X[missing].mean())
 
 
 def train_logistic_pd(
     X_train: pd.DataFrame,
-    y_train: pd.Series
+    y_train: pd.Series,
+    warm_start_from: Optional[LogisticRegression] = None,
+    config: SolverConfig = BASELINE_SOLVER
 ) -> LogisticRegression:
     """
     Train baseline logistic regression PD model.
+
+    Fits on standardized features with Newton-Cholesky by default (see
+    SolverConfig); coefficients are returned in original units. With
+    warm_start_from (a model fitted on the same feature columns, e.g.
+    before the latest vintage was added), the solver starts from its
+    coefficients instead of zero; the previous model is not modified.
     """
     X_train = _mean_impute_numeric(X_train)
-
-    model = LogisticRegression(
-        max_iter=2000,
-        solver="lbfgs"
-    )
-
-    model.fit(X_train, y_train)
-    return model
+    return fit_logistic(X_train, y_train, config, warm_start_from)
 
 
 def evaluate_pd(
@@ -42,15 +54,13 @@ def evaluate_pd(
     X_test = _mean_impute_numeric(X_test)
 
     y_prob = model.predict_proba(X_test)[:, 1]
-    return roc_auc_score(y_test, y_prob)
+    return rank_auc(y_test, y_prob)
 
-import joblib
-from src.config.paths import MODELS_DIR
+from src.models.registry import load_latest_model
 
 
 def load_trained_model():
     """
-    Load the previously trained baseline PD model from disk.
+    Load the most recently trained baseline PD model from the registry.
     """
-    model_path = MODELS_DIR / "baseline_pd_model.joblib"
-    return joblib.load(model_path)
+    return load_latest_model("baseline_pd").model
@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def stable_sigmoid(z: np.ndarray) -> np.ndarray:
+    """
+    Logistic function without overflow for large |z|.
+
+    exp is only ever taken of -|z|, so it stays in (0, 1].
+    """
+    e = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1.0 / (1.0 + e), e / (1.0 + e))
+
+
+@dataclass
+class LogisticScorer:
+    """
+    Compact coefficient form of a fitted logistic PD model.
+
+    Each row of coef/intercept is the linear predictor for one regime;
+    a baseline model has a single row. The regime-aware model built on
+    prepare_regime_features folds into two rows (Expansion: base terms;
+    Stress: base + interaction terms), so scoring never materializes the
+    interaction columns.
+    """
+    coef: np.ndarray
+    intercept: np.ndarray
+    feature_columns: List[str]
+    regimes: Optional[List[str]] = None
+
+    @classmethod
+    def from_model(
+        cls,
+        model,
+        feature_columns: List[str],
+        dtype=np.float64
+    ) -> "LogisticScorer":
+        """
+        Build from a fitted sklearn LogisticRegression or a
+        RegimeInteractionPD.
+
+        If feature_columns contains prepare_regime_features output
+        (regime_stress and *_x_stress), the interactions are folded into
+        per-regime coefficient rows over the base columns.
+        """
+        if hasattr(model, "regime_coefficients"):
+            coef, intercept, regimes = model.regime_coefficients()
+            return cls(
+                coef=np.ascontiguousarray(coef, dtype=dtype),
+                intercept=np.asarray(intercept, dtype=dtype),
+                feature_columns=list(feature_columns),
+                regimes=regimes,
+            )
+
+        coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+        b0 = float(model.intercept_[0])
+        weights = dict(zip(feature_columns, coef))
+
+        if "regime_stress" not in weights:
+            return cls(
+                coef=np.ascontiguousarray(coef[None, :], dtype=dtype),
+                intercept=np.array([b0], dtype=dtype),
+                feature_columns=list(feature_columns),
+            )
+
+        base_cols = [
+            c for c in feature_columns
+            if c != "regime_stress" and not c.endswith("_x_stress")
+        ]
+        base = np.array([weights[c] for c in base_cols])
+        delta = np.array([weights[f"{c}_x_stress"] for c in base_cols])
+
+        return cls(
+            coef=np.ascontiguousarray(np.vstack([base, base + delta]), dtype=dtype),
+            intercept=np.array([b0, b0 + weights["regime_stress"]], dtype=dtype),
+            feature_columns=base_cols,
+            regimes=["Expansion", "Stress"],
+        )
+
+    @classmethod
+    def from_artifact(cls, artifact, dtype=np.float64) -> "LogisticScorer":
+        """
+        Build from a registry ModelArtifact.
+        """
+        return cls.from_model(artifact.model, artifact.feature_columns, dtype=dtype)
+
+    def as_array(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Feature frame -> one C-contiguous matrix in scorer column order.
+        """
+        return np.ascontiguousarray(
+            X[self.feature_columns].to_numpy(dtype=self.coef.dtype)
+        )
+
+    def regime_codes(self, regime) -> np.ndarray:
+        """
+        Map regimes to coefficient rows.
+
+        Integer or boolean input is taken as row codes directly; labels
+        are matched with one vectorized comparison per regime.
+        """
+        if not isinstance(regime, pd.Series):
+            regime = pd.Series(regime)
+
+        if pd.api.types.is_integer_dtype(regime) or pd.api.types.is_bool_dtype(regime):
+            codes = regime.to_numpy(dtype=np.intp)
+        else:
+            codes = np.full(len(regime), -1, dtype=np.intp)
+            for row, label in enumerate(self.regimes):
+                codes[(regime == label).to_numpy()] = row
+
+        if ((codes < 0) | (codes >= len(self.regimes))).any():
+            raise ValueError(f"Unknown regimes; expected {self.regimes}")
+        return codes
+
+    def decision_function(self, X, regime=None) -> np.ndarray:
+        """
+        Linear predictor per loan.
+
+        Parameters
+        ----------
+        X : np.ndarray or pd.DataFrame
+            Imputed features; arrays must already be in feature_columns order
+        regime : array-like, optional
+            Regime label per loan; required for regime-aware scorers
+        """
+        if isinstance(X, pd.DataFrame):
+            X = self.as_array(X)
+
+        if self.regimes is None:
+            return X @ self.coef[0] + self.intercept[0]
+
+        if regime is None:
+            raise ValueError("Regime-aware scorer needs a regime per loan")
+
+        # One (n x R) product, then pick each loan's regime column
+        z = X @ self.coef.T + self.intercept
+        codes = self.regime_codes(regime)
+        return z[np.arange(len(codes)), codes]
+
+    def predict_pd(self, X, regime=None) -> np.ndarray:
+        """
+        Probability of default; equals predict_proba(X)[:, 1].
+        """
+        return stable_sigmoid(self.decision_function(X, regime))
+
+    def save(self, path: Path):
+        """
+        Write the coefficients to a small .npz file.
+        """
+        np.savez(
+            path,
+            coef=self.coef,
+            intercept=self.intercept,
+            feature_columns=np.array(self.feature_columns),
+            regimes=np.array(self.regimes or []),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "LogisticScorer":
+        """
+        Read a scorer written by save().
+        """
+        with np.load(path) as data:
+            regimes = data["regimes"].tolist()
+            return cls(
+                coef=data["coef"],
+                intercept=data["intercept"],
+                feature_columns=data["feature_columns"].tolist(),
+                regimes=regimes or None,
+            )
@@ -1,16 +1,37 @@
+import copy
+import time
+
+import numpy as np
 import pandas as pd
+from typing import List, Optional, Tuple
+
+from scipy.optimize import minimize
+from scipy.special import expit
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import roc_auc_score
+
+from src.models.metrics import rank_auc
+from src.models.solver import (
+    SolverConfig, fit_logistic, fit_scaling, to_original, to_scaled
+)
+
+
+# RegimeInteractionPD runs its own L-BFGS-B; standardized, it converges
+# in tens of iterations instead of hitting max_iter
+REGIME_SOLVER = SolverConfig(solver="lbfgs", tol=1e-5, max_iter=1000)
 
 
 def _mean_impute_numeric(X: pd.DataFrame) -> pd.DataFrame:
     """
     Mean-impute numeric columns only.
+
+    Only columns that contain NaNs are rewritten; the rest stay shared
+    with X under copy-on-write, and X itself is not modified.
     """
-    X = X.copy()
     num_cols = X.select_dtypes(include=["number"]).columns
-    X[num_cols] = X[num_cols].fillna(X[num_cols].mean())
-    return X
+    missing = [c for c in num_cols if X[c].isna().any()]
+    if not missing:
+        return X
+    return X.fillna(X[missing].mean())
 
 
 def prepare_regime_features(
@@ -19,46 +40,324 @@ def prepare_regime_features(
 ) -> pd.DataFrame:
     """
     Add regime dummy and interaction terms.
-    """
-    X_reg = X.copy()
 
-    # Regime indicator: 1 = Stress, 0 = Expansion
-    X_reg["regime_stress"] = (regime == "Stress").astype(int)
+    regime is a label per loan, or a DataFrame of regime probabilities
+    per loan (e.g. markov_switching.regime_weights), in which case
+    P(Stress) is used as a soft indicator. Only Expansion/Stress weights
+    fit this one-dummy layout; N-state weights go to RegimeInteractionPD.
+    The original columns of X are shared with the result, not copied.
+    """
+    if isinstance(regime, pd.DataFrame):
+        if sorted(regime.columns) != ["Expansion", "Stress"]:
+            raise ValueError(
+                "prepare_regime_features needs Expansion/Stress weights, got "
+                f"{list(regime.columns)}; use RegimeInteractionPD for N-state regimes"
+            )
+        regime_stress = regime["Stress"]
+    else:
+        # Regime indicator: 1 = Stress, 0 = Expansion
+        regime_stress = (regime == "Stress").astype(int)
 
     # Interaction terms
-    for col in X.columns:
-        X_reg[f"{col}_x_stress"] = X[col] * X_reg["regime_stress"]
+    interactions = {
+        f"{col}_x_stress": X[col] * regime_stress
+        for col in X.columns
+    }
+
+    return X.assign(regime_stress=regime_stress, **interactions)
+
+
+class RegimeInteractionPD:
+    """
+    Regime-aware logistic PD with implicit interaction terms.
+
+    Fits the same model as prepare_regime_features + LogisticRegression,
+
+        logit = b0 + X @ beta + sum_r w_r * (a_r + X @ delta_r),
+
+    where w_r is 1 for loans in regime r (the base regime has no terms),
+    or P(regime r) when soft weights are given as a DataFrame with one
+    column per regime, but never builds the interaction columns. Each L-BFGS step needs one
+    product X @ [beta, delta_1, ...] and one X.T @ residuals, so memory
+    stays at one copy of X plus a few n x R arrays, and any number of
+    regimes is supported. The objective (mean log loss plus
+    ||coef||^2 / (2 C n), intercept unpenalized) matches sklearn's
+    LogisticRegression.
+
+    With standardize=True (default) the fit runs on z-scored features,
+    so the penalty applies to standardized coefficients, and the scaling
+    is folded back: coefficients are per original unit.
+    With warm_start=True, a refit on data with the same features and
+    regimes starts from the current coefficients instead of zero.
+    base_regime falls back to the first label (first category, or
+    first weight column) when the labels have no such regime, e.g.
+    state_0 for N-state labels. Categorical labels get terms for every
+    category; a category with no training loans keeps zero terms (the
+    penalty is its only gradient), so it is scored as the base regime.
+    """
+
+    def __init__(
+        self,
+        base_regime: str = "Expansion",
+        C: float = 1.0,
+        max_iter: int = 3000,
+        tol: float = 1e-4,
+        warm_start: bool = False,
+        standardize: bool = True
+    ):
+        self.base_regime = base_regime
+        self.C = C
+        self.max_iter = max_iter
+        self.tol = tol
+        self.warm_start = warm_start
+        self.standardize = standardize
+
+    def _regime_weights(
+        self,
+        regime: pd.Series,
+        regimes: Optional[List[str]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Regime labels -> (regime order, n x (R-1) indicator matrix), or
+        regime probabilities (DataFrame) -> (regime order, weights).
+        """
+        if isinstance(regime, pd.DataFrame):
+            if regimes is None:
+                base = self._base([str(r) for r in regime.columns])
+                others = sorted(str(r) for r in regime.columns if r != base)
+                regimes = [base] + others
+            return regimes, regime[regimes[1:]].to_numpy(dtype=np.float64)
+
+        regime = pd.Series(regime)
+        if regimes is None:
+            # Categorical labels get a term per declared category, used
+            # in training or not, so later data with those categories
+            # can be scored
+            if isinstance(regime.dtype, pd.CategoricalDtype):
+                labels = [str(r) for r in regime.cat.categories]
+            else:
+                labels = sorted(str(r) for r in regime.dropna().unique())
+            base = self._base(labels)
+            regimes = [base] + sorted(r for r in labels if r != base)
+        elif not regime.isin(regimes).all():
+            # As LogisticScorer.regime_codes: unknown or missing labels
+            # must not be scored as the base regime
+            unknown = sorted(str(r) for r in regime[~regime.isin(regimes)].unique())
+            raise ValueError(
+                f"Unknown regimes {unknown}; expected {regimes} (the labels "
+                "seen in training, or all categories of a categorical)"
+            )
+
+        W = np.column_stack([
+            (regime == r).to_numpy(dtype=np.float64) for r in regimes[1:]
+        ]) if len(regimes) > 1 else np.zeros((len(regime), 0))
+        return regimes, W
+
+    def _base(self, labels: List[str]) -> str:
+        if self.base_regime in labels or not labels:
+            return self.base_regime
+        return labels[0]
+
+    def _unpack(self, theta: np.ndarray, p: int, k: int):
+        beta = theta[:p]
+        b0 = theta[p]
+        delta = theta[p + 1:p + 1 + k * p].reshape(k, p)
+        a = theta[p + 1 + k * p:]
+        return beta, b0, delta, a
+
+    def fit(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        regime: pd.Series
+    ) -> "RegimeInteractionPD":
+        """
+        Fit on base features X, target y and a regime label per loan
+        (or a DataFrame of regime probabilities per loan).
+        """
+        regimes, W = self._regime_weights(regime)
 
-    return X_reg
+        # Warm start only if the parameter layout is unchanged
+        previous = None
+        if (
+            self.warm_start
+            and hasattr(self, "coef_")
+            and self.feature_names_in_ == list(X.columns)
+            and self.regimes_ == regimes
+        ):
+            previous = (
+                np.vstack([self.coef_, self.regime_coef_]),
+                np.concatenate([self.intercept_, self.regime_intercept_]),
+            )
+
+        self.feature_names_in_ = list(X.columns)
+        self.regimes_ = regimes
+
+        X = np.array(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n, p = X.shape
+        k = W.shape[1]
+        penalty = 1.0 / (self.C * n)
+
+        if self.standardize:
+            mean, scale = fit_scaling(X)
+            X -= mean
+            X /= scale
+        else:
+            mean, scale = np.zeros(p), np.ones(p)
+
+        # Rows: base, then one per non-base regime
+        theta0 = np.zeros(p + 1 + k * p + k)
+        if previous is not None:
+            coef, intercept = to_scaled(*previous, mean, scale)
+            theta0 = np.concatenate([coef[0], intercept[:1], coef[1:].ravel(), intercept[1:]])
+
+        def loss_grad(theta):
+            beta, b0, delta, a = self._unpack(theta, p, k)
+
+            # One product gives the base and every regime's extra term
+            Z = X @ np.column_stack([beta, delta.T])
+            z = Z[:, 0] + b0 + (W * (Z[:, 1:] + a)).sum(axis=1)
+
+            loss = np.mean(np.logaddexp(0.0, z) - y * z)
+            g = expit(z) - y
+            G = W * g[:, None]
+
+            XtR = X.T @ np.column_stack([g, G])
+            grad = np.concatenate([
+                XtR[:, 0] / n + penalty * beta,
+                [g.mean()],
+                (XtR[:, 1:].T / n + penalty * delta).ravel(),
+                G.sum(axis=0) / n + penalty * a,
+            ])
+
+            reg = 0.5 * penalty * (beta @ beta + (delta * delta).sum() + a @ a)
+            return loss + reg, grad
+
+        start = time.perf_counter()
+        result = minimize(
+            loss_grad,
+            theta0,
+            method="L-BFGS-B",
+            jac=True,
+            options={
+                "maxiter": self.max_iter,
+                "maxls": 50,
+                "gtol": self.tol,
+                "ftol": 64 * np.finfo(float).eps,
+            },
+        )
+
+        self.fit_seconds_ = time.perf_counter() - start
+
+        beta, b0, delta, a = self._unpack(result.x, p, k)
+        coef, intercept = to_original(
+            np.vstack([beta, delta]), np.concatenate([[b0], a]), mean, scale
+        )
+        self.coef_ = coef[0]
+        self.intercept_ = intercept[:1]
+        self.regime_coef_ = coef[1:]
+        self.regime_intercept_ = intercept[1:]
+        self.feature_mean_ = mean
+        self.feature_scale_ = scale
+        self.n_iter_ = np.array([result.nit])
+        self.converged_ = bool(result.success)
+        return self
+
+    def regime_coefficients(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Effective (coef, intercept) per regime, rows in regimes_ order.
+        """
+        coef = np.vstack([self.coef_, self.coef_ + self.regime_coef_])
+        intercept = np.concatenate([
+            self.intercept_, self.intercept_[0] + self.regime_intercept_
+        ])
+        return coef, intercept, list(self.regimes_)
+
+    def decision_function(self, X: pd.DataFrame, regime: pd.Series) -> np.ndarray:
+        """
+        Linear predictor per loan.
+        """
+        coef, intercept, regimes = self.regime_coefficients()
+        _, W = self._regime_weights(regime, regimes)
+
+        Z = np.asarray(X[self.feature_names_in_], dtype=np.float64) @ coef.T + intercept
+        return Z[:, 0] + (W * (Z[:, 1:] - Z[:, [0]])).sum(axis=1)
+
+    def predict_proba(self, X: pd.DataFrame, regime: pd.Series) -> np.ndarray:
+        """
+        Class probabilities, shaped like LogisticRegression.predict_proba.
+        """
+        prob = expit(self.decision_function(X, regime))
+        return np.column_stack([1 - prob, prob])
 
 
 def train_regime_aware_pd(
     X_train: pd.DataFrame,
-    y_train: pd.Series
+    y_train: pd.Series,
+    config: SolverConfig = REGIME_SOLVER
 ) -> LogisticRegression:
     """
     Train regime-aware PD model with numeric imputation.
+
+    Expects X_train from prepare_regime_features; see
+    train_regime_interaction_pd for the implicit version. Fitted with
+    the same solver settings (standardized L-BFGS), so both give the
+    same PDs up to solver tolerance.
     """
     X_train = _mean_impute_numeric(X_train)
+    return fit_logistic(X_train, y_train, config)
+
 
-    model = LogisticRegression(
-        max_iter=3000,
-        solver="lbfgs"
-    )
+def train_regime_interaction_pd(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    regime: pd.Series,
+    warm_start_from: Optional[RegimeInteractionPD] = None,
+    config: SolverConfig = REGIME_SOLVER
+) -> RegimeInteractionPD:
+    """
+    Train regime-aware PD model on base features plus regime labels.
+
+    warm_start_from: previously fitted model to start from (not modified).
+    config: standardize, tol, max_iter and C; only solver="lbfgs" is
+    available for the implicit interaction model.
+    """
+    if config.solver != "lbfgs":
+        raise ValueError(
+            f"RegimeInteractionPD supports solver='lbfgs' only, got '{config.solver}'"
+        )
+    X_train = _mean_impute_numeric(X_train)
 
-    model.fit(X_train, y_train)
+    if warm_start_from is not None:
+        model = copy.deepcopy(warm_start_from)
+        model.warm_start = True
+    else:
+        model = RegimeInteractionPD()
+    model.C = config.C
+    model.tol = config.tol
+    model.max_iter = config.max_iter
+    model.standardize = config.standardize
+    model.fit(X_train, y_train, regime)
     return model
 
 
 def evaluate_pd(
-    model: LogisticRegression,
+    model,
     X_test: pd.DataFrame,
-    y_test: pd.Series
+    y_test: pd.Series,
+    regime: Optional[pd.Series] = None
 ) -> float:
     """
     Evaluate regime-aware PD using ROC-AUC.
+
+    Pass regime for a RegimeInteractionPD; a LogisticRegression expects
+    X_test from prepare_regime_features instead.
     """
     X_test = _mean_impute_numeric(X_test)
 
-    prob = model.predict_proba(X_test)[:, 1]
-    return roc_auc_score(y_test, prob)
+    if regime is None:
+        prob = model.predict_proba(X_test)[:, 1]
+    else:
+        prob = model.predict_proba(X_test, regime)[:, 1]
+    return rank_auc(y_test, prob)
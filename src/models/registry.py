@@ -0,0 +1,234 @@
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import joblib
+import pandas as pd
+import sklearn
+
+from src.config.paths import MODELS_DIR
+from src.features.schema import FeatureSchema
+
+
+# Bump whenever training code changes the fitted model, so stored
+# artifacts stop matching and are refit
+REGISTRY_VERSION = 2
+
+
+@dataclass
+class ModelArtifact:
+    """
+    A fitted PD model plus everything needed to reuse it safely.
+    """
+    name: str
+    model: object
+    feature_columns: List[str]
+    impute_means: Dict[str, float]
+    fingerprint: str
+    schema: Optional[FeatureSchema] = None
+    regime_rule: Optional[str] = None
+    sklearn_version: str = sklearn.__version__
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+
+def data_fingerprint(
+    X: pd.DataFrame,
+    y: pd.Series,
+    train_fn: Optional[Callable] = None,
+    **fit_kwargs
+) -> str:
+    """
+    Hash of the training data, its column layout and the trainer.
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        Training feature matrix
+    y : pd.Series
+        Training target
+    train_fn : callable, optional
+        Training function; its qualified name is part of the hash
+    **fit_kwargs
+        Extra trainer inputs (e.g. regime labels); pandas objects are
+        hashed by content, anything else by repr
+
+    Returns
+    -------
+    str
+        Hex digest identifying this (data, trainer) combination
+    """
+    h = hashlib.blake2b(digest_size=16)
+
+    h.update(f"registry-v{REGISTRY_VERSION}".encode())
+    h.update(f"sklearn-{sklearn.__version__}".encode())
+    if train_fn is not None:
+        h.update(f"{train_fn.__module__}.{train_fn.__qualname__}".encode())
+
+    h.update("|".join(f"{c}:{X[c].dtype}" for c in X.columns).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+
+    for key in sorted(fit_kwargs):
+        value = fit_kwargs[key]
+        h.update(key.encode())
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            h.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+        else:
+            h.update(repr(value).encode())
+
+    return h.hexdigest()
+
+
+def _artifact_path(name: str, fingerprint: str):
+    return MODELS_DIR / f"{name}_{fingerprint[:16]}.joblib"
+
+
+def save_model(
+    name: str,
+    model,
+    X_train: pd.DataFrame,
+    fingerprint: str,
+    schema: Optional[FeatureSchema] = None,
+    regime_rule: Optional[str] = None
+) -> ModelArtifact:
+    """
+    Store a fitted model with its feature order, training means and,
+    when given, the frozen feature schema used to build X_train and the
+    rule its regime labels came from (regime_labels.regime_rule).
+    """
+    num_cols = X_train.select_dtypes(include=["number"]).columns
+    impute_means = {
+        c: float(v) for c, v in X_train[num_cols].mean().items()
+    }
+
+    artifact = ModelArtifact(
+        name=name,
+        model=model,
+        feature_columns=list(X_train.columns),
+        impute_means=impute_means,
+        fingerprint=fingerprint,
+        schema=schema,
+        regime_rule=regime_rule,
+    )
+
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    path = _artifact_path(name, fingerprint)
+    tmp_path = path.with_suffix(".joblib.tmp")
+    joblib.dump(artifact, tmp_path)
+    tmp_path.replace(path)
+
+    print(f"Saved model: {path.name}")
+    return artifact
+
+
+def load_model(name: str, fingerprint: str) -> Optional[ModelArtifact]:
+    """
+    Load the artifact stored for exactly this fingerprint, or None.
+    """
+    path = _artifact_path(name, fingerprint)
+    if not path.exists():
+        return None
+
+    artifact = joblib.load(path)
+    if artifact.fingerprint != fingerprint:
+        return None
+    return artifact
+
+
+def load_latest_model(name: str, regime_rule: Optional[str] = None) -> ModelArtifact:
+    """
+    Load the most recently saved artifact for a model name; with
+    regime_rule, the most recent one whose regime labels came from that
+    rule (regime_labels.regime_rule).
+    """
+    # name_<fingerprint> only: "regime_pd_*" would also match
+    # regime_pd_markov_<fingerprint>
+    paths = sorted(
+        (p for p in MODELS_DIR.glob(f"{name}_*.joblib")
+         if "_" not in p.stem[len(name) + 1:]),
+        key=lambda p: p.stat().st_mtime
+    )
+    for path in reversed(paths):
+        artifact = joblib.load(path)
+        if regime_rule is None or artifact.regime_rule == regime_rule:
+            return artifact
+
+    if regime_rule is not None:
+        raise FileNotFoundError(
+            f"No stored '{name}' model with regimes labelled by {regime_rule!r} in {MODELS_DIR}"
+        )
+    raise FileNotFoundError(f"No stored '{name}' model in {MODELS_DIR}")
+
+
+def load_or_train(
+    name: str,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    train_fn: Callable,
+    schema: Optional[FeatureSchema] = None,
+    regime_rule: Optional[str] = None,
+    **fit_kwargs
+) -> ModelArtifact:
+    """
+    Return the stored model for this training data, fitting it on a miss.
+
+    Parameters
+    ----------
+    name : str
+        Registry name, e.g. "baseline_pd" or "regime_pd"
+    X_train : pd.DataFrame
+        Training feature matrix
+    y_train : pd.Series
+        Training target
+    train_fn : callable
+        Trainer called as train_fn(X_train, y_train, **fit_kwargs) on a
+        cache miss
+    schema : FeatureSchema, optional
+        Schema X_train was built with; stored so the model can score
+        new loan files
+    regime_rule : str, optional
+        Rule the regime labels in fit_kwargs came from
+        (regime_labels.regime_rule); a stored model with another rule
+        is not reused
+    **fit_kwargs
+        Extra trainer inputs, included in the fingerprint
+
+    Returns
+    -------
+    ModelArtifact
+        Artifact whose model was fit on exactly (X_train, y_train)
+    """
+    fingerprint = data_fingerprint(X_train, y_train, train_fn, **fit_kwargs)
+
+    artifact = load_model(name, fingerprint)
+    if (
+        artifact is not None
+        and artifact.feature_columns == list(X_train.columns)
+        and artifact.regime_rule == regime_rule
+    ):
+        print(f"Model cache hit: {name} ({fingerprint[:16]})")
+        return artifact
+
+    model = train_fn(X_train, y_train, **fit_kwargs)
+    return save_model(
+        name, model, X_train, fingerprint, schema=schema, regime_rule=regime_rule
+    )
+
+
+def align_features(X: pd.DataFrame, artifact: ModelArtifact) -> pd.DataFrame:
+    """
+    Reorder X to the artifact's training columns and impute with the
+    training means, returning the frame the model expects.
+    """
+    missing = [c for c in artifact.feature_columns if c not in X.columns]
+    if missing:
+        raise ValueError(f"Features missing for '{artifact.name}': {missing}")
+
+    X = X[artifact.feature_columns]
+    fill = {c: m for c, m in artifact.impute_means.items() if X[c].isna().any()}
+    if fill:
+        X = X.fillna(fill)
+    return X
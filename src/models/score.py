@@ -0,0 +1,194 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config.paths import RAW_DATA
+from src.data.dates import parse_issue_months
+from src.data.load import iter_lendingclub_chunks, load_fred_macro
+from src.data.merge_macro import merge_loans_with_macro
+from src.models.fast_scorer import LogisticScorer
+from src.models.registry import ModelArtifact, load_latest_model
+from src.regimes.regime_labels import assign_macro_regime
+from src.reporting.quantile_sketch import KLLSketch, merge_sketches, sketch_by_group
+
+
+TAIL_QUANTILES = [0.5, 0.9, 0.95, 0.99]
+
+_OUTPUT_SCHEMA = pa.schema([
+    ("row", pa.int64()),
+    ("pd_hat", pa.float64()),
+])
+
+
+def _uses_regime(artifact: ModelArtifact) -> bool:
+    return LogisticScorer.from_artifact(artifact).regimes is not None
+
+
+def iter_scored_chunks(
+    loans_path: Path,
+    artifact: ModelArtifact,
+    macro_df: Optional[pd.DataFrame] = None,
+    unemployment_threshold: float = 6.0,
+    chunksize: int = 250_000
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Stream a loan file through a stored model, one chunk at a time.
+
+    Features are built with the artifact's frozen schema (training
+    levels, column order and imputation means), so every chunk yields
+    the same matrix layout regardless of which grades or terms it holds.
+    PDs come from the model's LogisticScorer form, so regime-aware
+    models are scored without building interaction columns.
+
+    Parameters
+    ----------
+    loans_path : Path
+        Raw LendingClub-format CSV to score (all loan statuses are kept)
+    artifact : ModelArtifact
+        Registry artifact with a schema
+    macro_df : pd.DataFrame, optional
+        FRED macro data; required for regime-aware models
+    unemployment_threshold : float
+        Regime threshold for regime-aware models
+    chunksize : int
+        Rows per chunk
+
+    Yields
+    ------
+    chunk, pd_hat : pd.DataFrame, np.ndarray
+        Raw chunk and the predicted PD for each of its rows
+    """
+    if artifact.schema is None:
+        raise ValueError(
+            f"Model '{artifact.name}' was stored without a feature schema; "
+            "retrain it through run_all to make it scorable"
+        )
+    if _uses_regime(artifact) and macro_df is None:
+        raise ValueError(f"Model '{artifact.name}' needs macro data to score")
+
+    schema = artifact.schema
+    scorer = LogisticScorer.from_artifact(artifact)
+
+    for chunk in iter_lendingclub_chunks(loans_path, chunksize=chunksize, statuses=None):
+        X = scorer.as_array(schema.impute(schema.transform(chunk)))
+
+        regime = None
+        if _uses_regime(artifact):
+            chunk = chunk.assign(issue_month=parse_issue_months(chunk["issue_d"]))
+            chunk = merge_loans_with_macro(chunk, macro_df)
+            chunk = assign_macro_regime(chunk, unemployment_threshold)
+            regime = chunk["regime"]
+
+        yield chunk, scorer.predict_pd(X, regime)
+
+
+def score_file(
+    loans_path: Path,
+    output_path: Path,
+    artifact: ModelArtifact,
+    macro_df: Optional[pd.DataFrame] = None,
+    unemployment_threshold: float = 6.0,
+    chunksize: int = 250_000,
+    sketch_k: int = 400
+) -> dict:
+    """
+    Score a loan file and write row number and PD to Parquet.
+
+    PDs are also streamed into KLL quantile sketches (pooled, and per
+    regime for regime-aware models), so tail PDs and decile edges of
+    the scored file are available without holding every PD in memory.
+
+    Returns
+    -------
+    dict
+        n_loans, seconds and loans_per_second for the whole run, plus
+        pd_sketch (KLLSketch) and regime_sketches (dict, may be empty)
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    n_loans = 0
+    pd_sketch = KLLSketch(k=sketch_k)
+    regime_sketches = {}
+    # One child seed per chunk, so chunk sketches compact independently
+    chunk_seeds = np.random.SeedSequence(0)
+
+    with pq.ParquetWriter(output_path, _OUTPUT_SCHEMA) as writer:
+        for chunk, pd_hat in iter_scored_chunks(
+            loans_path,
+            artifact,
+            macro_df=macro_df,
+            unemployment_threshold=unemployment_threshold,
+            chunksize=chunksize
+        ):
+            table = pa.table(
+                {"row": chunk.index.to_numpy(dtype=np.int64), "pd_hat": pd_hat},
+                schema=_OUTPUT_SCHEMA
+            )
+            writer.write_table(table)
+            n_loans += len(chunk)
+
+            pd_sketch.update(pd_hat)
+            if "regime" in chunk:
+                regime_sketches = merge_sketches([
+                    regime_sketches,
+                    sketch_by_group(
+                        pd.Series(pd_hat, index=chunk.index), chunk["regime"],
+                        k=sketch_k, seed=chunk_seeds.spawn(1)[0]
+                    ),
+                ])
+
+    seconds = time.perf_counter() - start
+    return {
+        "n_loans": n_loans,
+        "seconds": seconds,
+        "loans_per_second": n_loans / seconds if seconds > 0 else float("nan"),
+        "pd_sketch": pd_sketch,
+        "regime_sketches": regime_sketches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score a LendingClub-format loan file with a stored PD model."
+    )
+    parser.add_argument("--model", default="baseline_pd", help="Registry name")
+    parser.add_argument("--input", type=Path, required=True)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--macro", type=Path, default=RAW_DATA / "fred_macro.csv")
+    parser.add_argument("--unemployment-threshold", type=float, default=6.0)
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    args = parser.parse_args()
+
+    artifact = load_latest_model(args.model)
+    macro_df = load_fred_macro(args.macro) if _uses_regime(artifact) else None
+
+    stats = score_file(
+        args.input,
+        args.output,
+        artifact,
+        macro_df=macro_df,
+        unemployment_threshold=args.unemployment_threshold,
+        chunksize=args.chunksize
+    )
+
+    print(f"Scored {stats['n_loans']:,} loans in {stats['seconds']:.2f}s "
+          f"({stats['loans_per_second']:,.0f} loans/s) -> {args.output}")
+
+    sketches = {"All loans": stats["pd_sketch"], **stats["regime_sketches"]}
+    tail = pd.DataFrame({
+        label: sketch.quantiles(TAIL_QUANTILES) for label, sketch in sketches.items()
+    }, index=[f"{q:.0%} PD" for q in TAIL_QUANTILES]).T
+    print(tail.round(4))
+    edges = stats["pd_sketch"].decile_edges()
+    print("PD decile edges:", np.round(edges, 4).tolist())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import warnings
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+from sklearn.exceptions import ConvergenceWarning
+
+from src.data.clean import clean_lendingclub
+from src.data.load import iter_lendingclub_chunks
+from src.data.split import issued_through
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+
+
+ChunkSource = Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]]
+
+
+def iter_training_frames(
+    loans_path: Path,
+    train_end_date: Optional[str] = None,
+    chunksize: int = 250_000
+) -> Iterator[pd.DataFrame]:
+    """
+    Cleaned loan chunks from the raw CSV, restricted to the training
+    window (issued through train_end_date, as in time_based_split).
+    """
+    for chunk in iter_lendingclub_chunks(loans_path, chunksize=chunksize):
+        chunk = clean_lendingclub(chunk)
+        if train_end_date is not None:
+            chunk = chunk[issued_through(chunk, train_end_date)]
+        if len(chunk):
+            yield chunk
+
+
+def iter_training_chunks(
+    loans_path: Path,
+    schema: FeatureSchema,
+    train_end_date: Optional[str] = None,
+    chunksize: int = 250_000
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Imputed float64 (X, y) blocks in schema column order.
+    """
+    for chunk in iter_training_frames(loans_path, train_end_date, chunksize):
+        X, y = build_features(chunk, schema)
+        X = schema.impute(X)
+        yield X.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)
+
+
+class StreamingLogisticPD:
+    """
+    Logistic PD fitted out of core by chunked Newton (IRLS) steps.
+
+    Each iteration is one pass over the chunks, accumulating the
+    penalized log loss, its gradient and the (p+1) x (p+1) Hessian
+    X.T @ diag(pi (1 - pi)) @ X. Only those sufficient statistics and
+    one chunk are in memory, so the training set can be larger than
+    RAM. The objective is sklearn's LogisticRegression one on raw
+    features (sum of log loss + ||coef||^2 / (2 C), intercept
+    unpenalized); train_logistic_pd penalizes standardized coefficients
+    instead, a difference that vanishes as n grows. Newton gets there
+    in a handful of passes without feature scaling.
+
+    Exposes coef_, intercept_, classes_ and predict_proba like
+    LogisticRegression, so evaluate_pd, the registry and
+    LogisticScorer work unchanged. converged_ is False (with a
+    ConvergenceWarning) when max_iter is reached or a Newton step finds
+    no decrease; the last accepted coefficients are kept.
+    """
+
+    def __init__(
+        self,
+        C: float = 1.0,
+        max_iter: int = 50,
+        tol: float = 1e-7
+    ):
+        self.C = C
+        self.max_iter = max_iter
+        self.tol = tol
+
+    def _pass(self, chunks: ChunkSource, theta: np.ndarray):
+        """
+        One pass: (objective, gradient, Hessian, n) at theta = [coef, b0].
+        """
+        p = len(theta) - 1
+        loss = 0.0
+        grad = np.zeros(p + 1)
+        hess = np.zeros((p + 1, p + 1))
+        n = 0
+
+        for X, y in chunks():
+            Xb = np.column_stack([X, np.ones(len(X))])
+            z = Xb @ theta
+            prob = expit(z)
+            weight = prob * (1.0 - prob)
+
+            loss += np.sum(np.logaddexp(0.0, z) - y * z)
+            grad += Xb.T @ (prob - y)
+            hess += (Xb * weight[:, None]).T @ Xb
+            n += len(y)
+
+        ridge = np.r_[np.full(p, 1.0 / self.C), 0.0]
+        loss += 0.5 * np.sum(ridge * theta * theta)
+        grad += ridge * theta
+        hess[np.diag_indices_from(hess)] += ridge
+        return loss, grad, hess, n
+
+    @staticmethod
+    def _newton_step(grad: np.ndarray, hess: np.ndarray) -> np.ndarray:
+        # Jacobi scaling keeps the solve well conditioned even though
+        # raw features (annual_inc vs dummies) differ by orders of magnitude
+        d = 1.0 / np.sqrt(np.maximum(np.diag(hess), 1e-300))
+        return d * np.linalg.solve(hess * np.outer(d, d), d * grad)
+
+    def fit(
+        self,
+        chunks: ChunkSource,
+        feature_names: Optional[List[str]] = None
+    ) -> "StreamingLogisticPD":
+        """
+        Fit from a chunk source: a callable returning a fresh iterable
+        of (X, y) arrays each time it is called (one call per pass).
+        """
+        X0, _ = next(iter(chunks()))
+        p = X0.shape[1]
+        del X0
+
+        theta = np.zeros(p + 1)
+        loss, grad, hess, n = self._pass(chunks, theta)
+
+        self.n_iter_ = np.array([0])
+        self.converged_ = False
+        for it in range(1, self.max_iter + 1):
+            step = self._newton_step(grad, hess)
+
+            # Converged when no coefficient moves the linear predictor
+            # by more than tol (step scaled by its Hessian curvature)
+            scaled_step = np.abs(step) * np.sqrt(np.diag(hess) / n)
+            if scaled_step.max() < self.tol:
+                self.converged_ = True
+                break
+
+            # Halve the step until the objective decreases; if it never
+            # does, keep theta and stop rather than accept a worse point
+            t = 1.0
+            while t >= 1e-4:
+                candidate = theta - t * step
+                new_loss, new_grad, new_hess, _ = self._pass(chunks, candidate)
+                if new_loss <= loss:
+                    break
+                t *= 0.5
+            else:
+                break
+
+            theta, loss, grad, hess = candidate, new_loss, new_grad, new_hess
+            self.n_iter_ = np.array([it])
+
+        if not self.converged_:
+            warnings.warn(
+                f"StreamingLogisticPD stopped after {int(self.n_iter_[0])} Newton "
+                "iterations without converging", ConvergenceWarning
+            )
+
+        self.coef_ = theta[None, :p]
+        self.intercept_ = theta[p:]
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = p
+        self.objective_ = loss / n
+        if feature_names is not None:
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        return self
+
+    def decision_function(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef_[0] + self.intercept_[0]
+
+    def predict_proba(self, X) -> np.ndarray:
+        prob = expit(self.decision_function(X))
+        return np.column_stack([1 - prob, prob])
+
+
+def train_logistic_pd_streaming(
+    loans_path: Path,
+    train_end_date: Optional[str] = None,
+    chunksize: int = 250_000,
+    schema: Optional[FeatureSchema] = None
+) -> Tuple[StreamingLogisticPD, FeatureSchema]:
+    """
+    Train the baseline PD model straight from the raw CSV, chunk by chunk.
+
+    The feature schema (levels, imputation means) is learned in one
+    streaming pass unless given; each Newton iteration then re-reads
+    the file. Peak memory is set by chunksize, not by the file size.
+    """
+    if schema is None:
+        schema = FeatureSchema.fit_chunks(
+            iter_training_frames(loans_path, train_end_date, chunksize)
+        )
+
+    def chunks():
+        return iter_training_chunks(loans_path, schema, train_end_date, chunksize)
+
+    model = StreamingLogisticPD().fit(chunks, feature_names=schema.columns)
+    return model, schema
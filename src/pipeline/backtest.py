@@ -0,0 +1,262 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+
+from src.data.cache import load_loan_panel
+from src.data.dates import NAT_MONTH, month_end, month_ordinal
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+from src.models.baseline_pd import train_logistic_pd
+from src.models.metrics import rank_auc
+from src.models.regime_pd import train_regime_interaction_pd
+
+
+# Months between cutoffs (cutoffs fall on month or quarter ends)
+CUTOFF_MONTHS = {"M": 1, "Q": 3}
+
+# Months of history before the first cutoff, and months scored after each
+MIN_TRAIN_MONTHS = 24
+TEST_MONTHS = 12
+
+Fold = Tuple[pd.Timestamp, int, int]
+
+
+def backtest_folds(
+    issue_month: np.ndarray,
+    freq: str = "Q",
+    min_train_months: int = MIN_TRAIN_MONTHS,
+    test_months: int = TEST_MONTHS
+) -> List[Fold]:
+    """
+    Rolling-origin folds over a panel sorted by issue month.
+
+    Cutoffs are month or quarter ends from min_train_months after the
+    first issue month to test_months before the last, so every test
+    window is complete. Each fold is (cutoff, train_end, test_end):
+    rows [0, train_end) were issued in or before the cutoff month, rows
+    [train_end, test_end) in the test_months after it, found with
+    np.searchsorted on the sorted month ordinals.
+    """
+    months = month_ordinal(issue_month)
+
+    cutoffs = np.arange(months[0] + min_train_months, months[-1] - test_months + 1)
+    cutoffs = cutoffs[(cutoffs + 1) % CUTOFF_MONTHS[freq] == 0]
+
+    train_end = np.searchsorted(months, cutoffs, side="right")
+    test_end = np.searchsorted(months, cutoffs + test_months, side="right")
+    return list(zip(month_end(cutoffs), train_end.tolist(), test_end.tolist()))
+
+
+def _prefix_means(X: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cumulative non-missing sums and counts, so the training mean of any
+    prefix [0, k) is sums[k] / counts[k].
+    """
+    values = X[columns].to_numpy(dtype=np.float64)
+    observed = ~np.isnan(values)
+    zero = np.zeros((1, len(columns)))
+    sums = np.vstack([zero, np.cumsum(np.where(observed, values, 0.0), axis=0)])
+    counts = np.vstack([zero, np.cumsum(observed, axis=0)])
+    return sums, counts
+
+
+def _fold_metrics(observed: np.ndarray, baseline_pd: np.ndarray, regime_pd: np.ndarray) -> Dict:
+    """
+    Default rate, AUC, mean PD and Brier score of both models on one
+    test window (NaN if it has no loans).
+    """
+    if len(observed) == 0:
+        return dict.fromkeys(
+            ["default_rate", "baseline_auc", "regime_auc", "baseline_mean_pd",
+             "regime_mean_pd", "baseline_brier", "regime_brier"], np.nan
+        )
+    return {
+        "default_rate": observed.mean(),
+        "baseline_auc": rank_auc(observed, baseline_pd),
+        "regime_auc": rank_auc(observed, regime_pd),
+        "baseline_mean_pd": baseline_pd.mean(),
+        "regime_mean_pd": regime_pd.mean(),
+        "baseline_brier": np.mean((baseline_pd - observed) ** 2),
+        "regime_brier": np.mean((regime_pd - observed) ** 2),
+    }
+
+
+def _run_chain(
+    X: pd.DataFrame,
+    y: pd.Series,
+    regime: pd.Series,
+    regime_codes: np.ndarray,
+    folds: List[Fold],
+    prefix: Tuple[np.ndarray, np.ndarray],
+    num_cols: List[str],
+    regime_counts: np.ndarray
+) -> List[Dict]:
+    """
+    Fit and score consecutive folds, each warm-started from the models
+    of the previous cutoff.
+    """
+    sums, counts = prefix
+    baseline, regime_model = None, None
+    rows = []
+
+    for cutoff, train_end, test_end in folds:
+        X_train, y_train = X.iloc[:train_end], y.iloc[:train_end]
+        X_test, y_test = X.iloc[train_end:test_end], y.iloc[train_end:test_end]
+
+        # Test numerics are imputed with the training window's means
+        means = sums[train_end] / np.maximum(counts[train_end], 1)
+        X_test = X_test.fillna(dict(zip(num_cols, means)))
+
+        warm = baseline is not None
+        start = time.perf_counter()
+        baseline = train_logistic_pd(X_train, y_train, warm_start_from=baseline)
+        baseline_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        regime_model = train_regime_interaction_pd(
+            X_train, y_train, regime.iloc[:train_end], warm_start_from=regime_model
+        )
+        regime_s = time.perf_counter() - start
+
+        # Test loans in regimes with no training loans (or no regime):
+        # the regime model's terms for them are not identified, so both
+        # models are scored on the other loans only
+        test_regime = regime.iloc[train_end:test_end]
+        codes = regime_codes[train_end:test_end]
+        seen = (codes >= 0) & (regime_counts[train_end][codes] > 0)
+
+        baseline_pd = baseline.predict_proba(X_test[seen])[:, 1]
+        regime_pd = regime_model.predict_proba(X_test[seen], test_regime[seen])[:, 1]
+        observed = y_test.to_numpy(dtype=np.float64)[seen]
+
+        rows.append({
+            "cutoff": cutoff,
+            "n_train": train_end,
+            "n_test": test_end - train_end,
+            "unseen_regime_share": 1 - seen.mean(),
+            **_fold_metrics(observed, baseline_pd, regime_pd),
+            "warm_start": warm,
+            "baseline_iter": int(baseline.n_iter_[0]),
+            "regime_iter": int(regime_model.n_iter_[0]),
+            "baseline_fit_s": baseline_s,
+            "regime_fit_s": regime_s,
+        })
+    return rows
+
+
+def rolling_backtest(
+    panel: pd.DataFrame,
+    freq: str = "Q",
+    min_train_months: int = MIN_TRAIN_MONTHS,
+    test_months: int = TEST_MONTHS,
+    n_jobs: int = -1
+) -> pd.DataFrame:
+    """
+    Walk-forward backtest of the baseline and regime-aware PD models.
+
+    The panel is sorted by issue month once (undated loans are left
+    out) and its features built once (dummy layout from the whole
+    panel); every fold is then a pair of
+    positional slices, with no boolean-mask copy of the panel per
+    split. Consecutive cutoffs are grouped into contiguous chains, one
+    per joblib worker: chains run in parallel, and within a chain each
+    fold starts both solvers from the previous cutoff's coefficients.
+    Both solvers converge to tolerance, so warm and cold starts give the
+    same models up to that tolerance.
+
+    Parameters
+    ----------
+    panel : pd.DataFrame
+        Loan panel with issue_month, regime and the feature columns
+    freq : str
+        "M" for monthly or "Q" for quarterly cutoffs
+    min_train_months : int
+        History required before the first cutoff
+    test_months : int
+        Months after each cutoff used as its test window
+    n_jobs : int
+        joblib workers (-1 = all cores); also the number of chains
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per cutoff: sizes, share of test loans in a regime absent
+        from training (left out of every metric), observed default rate,
+        AUC, mean PD and Brier score of both models on the other test
+        loans, iterations and fit seconds
+    """
+    months = month_ordinal(panel["issue_month"])
+    order = np.flatnonzero(months != NAT_MONTH)
+    order = order[np.argsort(months[order], kind="stable")]
+    panel = panel.take(order)
+
+    folds = backtest_folds(months[order], freq, min_train_months, test_months)
+    if not folds:
+        raise ValueError("No cutoffs: the panel is shorter than min_train_months + test_months")
+
+    schema = FeatureSchema.fit(panel)
+    X, y = build_features(panel, schema)
+    num_cols = list(schema.num_features)
+    prefix = _prefix_means(X, num_cols)
+
+    # Loans per regime in every prefix [0, k)
+    codes, regimes = pd.factorize(panel["regime"])
+    onehot = np.zeros((len(codes) + 1, len(regimes)), dtype=np.int64)
+    onehot[np.arange(1, len(codes) + 1)[codes >= 0], codes[codes >= 0]] = 1
+    regime_counts = np.cumsum(onehot, axis=0)
+
+    n_chains = min(effective_n_jobs(n_jobs), len(folds))
+    chains = [list(c) for c in np.array_split(np.arange(len(folds)), n_chains)]
+
+    parts = Parallel(n_jobs=n_chains)(
+        delayed(_run_chain)(
+            X, y, panel["regime"], codes, [folds[i] for i in chain], prefix, num_cols,
+            regime_counts
+        )
+        for chain in chains
+    )
+    return pd.DataFrame([row for part in parts for row in part]).set_index("cutoff")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rolling-origin backtest of the baseline and regime-aware PD models."
+    )
+    parser.add_argument("--freq", choices=sorted(CUTOFF_MONTHS), default="Q")
+    parser.add_argument("--min-train-months", type=int, default=MIN_TRAIN_MONTHS)
+    parser.add_argument("--test-months", type=int, default=TEST_MONTHS)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument(
+        "--output", type=Path, default=Path("reports/tables/backtest.csv")
+    )
+    args = parser.parse_args()
+
+    panel = load_loan_panel()
+
+    start = time.perf_counter()
+    results = rolling_backtest(
+        panel, args.freq, args.min_train_months, args.test_months, args.n_jobs
+    )
+    seconds = time.perf_counter() - start
+
+    columns = ["n_train", "n_test", "unseen_regime_share", "default_rate",
+               "baseline_auc", "regime_auc", "baseline_mean_pd", "regime_mean_pd",
+               "baseline_fit_s", "regime_fit_s"]
+    print(results[columns].round(4).to_string())
+
+    fit_s = results[["baseline_fit_s", "regime_fit_s"]].to_numpy().sum()
+    print(f"\n{len(results)} cutoffs in {seconds:.2f}s ({fit_s:.2f}s fitting); "
+          f"mean AUC gain {(results['regime_auc'] - results['baseline_auc']).mean():+.4f}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(args.output)
+    print(f"Saved table: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
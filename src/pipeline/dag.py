@@ -0,0 +1,204 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+from src.config.paths import PROCESSED_DATA
+from src.data.cache import PANEL_CACHE_VERSION, file_digest
+
+
+# Bump whenever a stage function changes its output, so persisted
+# stage results stop matching and are recomputed. Keys also include
+# PANEL_CACHE_VERSION: a panel schema change is bumped there only.
+STAGE_CACHE_VERSION = 4
+
+STAGE_STORE = PROCESSED_DATA / "stages"
+
+
+def _as_paths(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(Path(p) for p in value)
+    return Path(value)
+
+
+def _input_digest(value):
+    if isinstance(value, tuple):
+        return [file_digest(p) for p in value]
+    return file_digest(value)
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    The stage is called as fn(*dep_results, **inputs, **params). An
+    input is a path or a tuple of paths. Its key hashes the function,
+    params, the content of every input file and the keys of its
+    dependencies, so it is known before anything runs. A persisted
+    DataFrame stage with a path is stored there by writer instead of in
+    the stage store, so it shares a cache that exists outside the graph
+    (the load_loan_panel panel).
+    """
+    name: str
+    fn: Callable
+    deps: Tuple[str, ...] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    persist: bool = False
+    path: Optional[Path] = None
+    writer: Optional[Callable[[pd.DataFrame, Path], None]] = None
+
+
+class Pipeline:
+    """
+    Stage graph with in-process and on-disk memoization.
+
+    Every stage runs at most once per Pipeline; stages marked persist
+    are also written to STAGE_STORE (DataFrames as Parquet, anything
+    else with joblib), so a later process with the same key loads the
+    result without computing any of its upstream stages.
+    """
+
+    def __init__(self, store_dir: Path = STAGE_STORE):
+        self.store_dir = Path(store_dir)
+        self.stages: Dict[str, Stage] = {}
+        self._keys: Dict[str, str] = {}
+        self._results: Dict[str, Any] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable,
+        deps: Iterable[str] = (),
+        params: Optional[Dict[str, Any]] = None,
+        inputs: Optional[Dict[str, Any]] = None,
+        persist: bool = False,
+        path: Optional[Path] = None,
+        writer: Optional[Callable[[pd.DataFrame, Path], None]] = None
+    ) -> "Pipeline":
+        """
+        Register a stage; dependencies must already be registered.
+        path and writer (both or neither) persist a DataFrame result
+        at path instead of in the stage store.
+        """
+        deps = tuple(deps)
+        unknown = [d for d in deps if d not in self.stages]
+        if unknown:
+            raise KeyError(f"Stage '{name}' depends on unknown stages: {unknown}")
+        if (path is None) != (writer is None):
+            raise ValueError(f"Stage '{name}': pass both path and writer, or neither")
+
+        self.stages[name] = Stage(
+            name=name,
+            fn=fn,
+            deps=deps,
+            params=dict(params or {}),
+            inputs={k: _as_paths(v) for k, v in (inputs or {}).items()},
+            persist=persist or path is not None,
+            path=None if path is None else Path(path),
+            writer=writer,
+        )
+        return self
+
+    def key(self, name: str) -> str:
+        """
+        Hash identifying a stage's result (its own settings plus the
+        keys of everything upstream).
+        """
+        if name in self._keys:
+            return self._keys[name]
+
+        stage = self.stages[name]
+        payload = {
+            "version": [STAGE_CACHE_VERSION, PANEL_CACHE_VERSION],
+            "name": name,
+            "fn": f"{stage.fn.__module__}.{stage.fn.__qualname__}",
+            "params": {k: repr(v) for k, v in stage.params.items()},
+            "inputs": {k: _input_digest(v) for k, v in stage.inputs.items()},
+            "deps": [self.key(d) for d in stage.deps],
+        }
+        blob = json.dumps(payload, sort_keys=True).encode()
+        self._keys[name] = hashlib.blake2b(blob, digest_size=8).hexdigest()
+        return self._keys[name]
+
+    def _path(self, name: str, result_type: str) -> Path:
+        suffix = "parquet" if result_type == "frame" else "joblib"
+        return self.store_dir / f"{name}_{self.key(name)}.{suffix}"
+
+    def _load(self, name: str):
+        if self.stages[name].path is not None:
+            path = self.stages[name].path
+            if path.exists():
+                print(f"Stage cache hit: {name} ({path.name})")
+                return True, pd.read_parquet(path, memory_map=True)
+            return False, None
+
+        for result_type, reader in (
+            ("frame", lambda p: pd.read_parquet(p, memory_map=True)),
+            ("object", joblib.load),
+        ):
+            path = self._path(name, result_type)
+            if path.exists():
+                print(f"Stage cache hit: {name} ({path.name})")
+                return True, reader(path)
+        return False, None
+
+    def _save(self, name: str, result):
+        if self.stages[name].writer is not None:
+            self.stages[name].writer(result, self.stages[name].path)
+            return
+
+        is_frame = isinstance(result, pd.DataFrame)
+        path = self._path(name, "frame" if is_frame else "object")
+
+        # Write atomically, then drop results stored under older keys
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        if is_frame:
+            result.to_parquet(tmp_path)
+        else:
+            joblib.dump(result, tmp_path)
+        tmp_path.replace(path)
+
+        for stale in self.store_dir.glob(f"{name}_*"):
+            if stale != path and stale.stem.rsplit("_", 1)[0] == name:
+                stale.unlink()
+
+    def get(self, name: str):
+        """
+        Result of one stage, computing missing upstream stages first.
+        """
+        if name in self._results:
+            return self._results[name]
+
+        stage = self.stages[name]
+
+        if stage.persist:
+            found, result = self._load(name)
+            if found:
+                self._results[name] = result
+                return result
+
+        args = [self.get(d) for d in stage.deps]
+
+        start = time.perf_counter()
+        result = stage.fn(*args, **stage.inputs, **stage.params)
+        print(f"Stage computed: {name} ({time.perf_counter() - start:.2f}s)")
+
+        if stage.persist:
+            self._save(name, result)
+
+        self._results[name] = result
+        return result
+
+    def run(self, names: Iterable[str]) -> Dict[str, Any]:
+        """
+        Results for several stages, sharing every common upstream stage.
+        """
+        return {name: self.get(name) for name in names}
@@ -0,0 +1,128 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.dates import month_ordinal
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+from src.models.baseline_pd import train_logistic_pd
+from src.models.bootstrap import N_BOOT, Difference, bootstrap_ci, loan_cells, strata_codes
+from src.models.metrics import RankAUC, rank_auc
+from src.models.regime_pd import train_regime_interaction_pd
+from src.models.registry import load_or_train
+from src.regimes.regime_labels import RegimeSpec, regime_rule
+from src.reporting.cube import pd_bucket
+
+
+# Last issue date of the training window of the model comparison
+TRAIN_END_DATE = "2016-12-31"
+
+# PD buckets of the bootstrap cells; bucketing moves the AUCs by a few
+# 1e-6, far inside their intervals
+AUC_PD_BUCKETS = 1000
+
+Split = Tuple[pd.DataFrame, pd.DataFrame]
+
+
+def split_features(split: Split) -> tuple:
+    """
+    Imputed train and test features from one frozen schema, so test
+    dummies and imputation means come from the training data.
+
+    Returns (schema, X_train, y_train, X_test, y_test).
+    """
+    train_df, test_df = split
+    schema = FeatureSchema.fit(train_df)
+    X_train, y_train = build_features(train_df, schema)
+    X_test, y_test = build_features(test_df, schema)
+    return schema, schema.impute(X_train), y_train, schema.impute(X_test), y_test
+
+
+def fit_test_baseline(features: tuple):
+    """
+    Baseline PD on the training window (registry name "baseline_pd").
+    """
+    schema, X_train, y_train, _, _ = features
+    return load_or_train(
+        "baseline_pd", X_train, y_train, train_logistic_pd, schema=schema
+    ).model
+
+
+def fit_test_regime_model(
+    split: Split,
+    features: tuple,
+    unemployment_threshold: float = 6.0,
+    regime_spec: Optional[RegimeSpec] = None
+):
+    """
+    Regime-aware PD on the training window (registry name "regime_pd"),
+    stored with the rule the panel's regimes were labelled by.
+
+    RegimeInteractionPD fits the prepare_regime_features +
+    train_regime_aware_pd model on the base features and regime labels,
+    without building the interaction columns.
+    """
+    train_df, _ = split
+    schema, X_train, y_train, _, _ = features
+    return load_or_train(
+        "regime_pd", X_train, y_train, train_regime_interaction_pd, schema=schema,
+        regime_rule=regime_rule(unemployment_threshold, regime_spec), regime=train_df["regime"]
+    ).model
+
+
+def score_test_loans(split: Split, features: tuple, baseline, regime_model) -> pd.DataFrame:
+    """
+    Test loans with default, regime, issue month and both models' PDs.
+    """
+    _, test_df = split
+    _, _, _, X_test, y_test = features
+    return pd.DataFrame({
+        "default": y_test.to_numpy(),
+        "regime": test_df["regime"].to_numpy(),
+        "issue_month": test_df["issue_month"].to_numpy(),
+        "baseline_pd": baseline.predict_proba(X_test)[:, 1],
+        "regime_pd": regime_model.predict_proba(X_test, test_df["regime"])[:, 1],
+    }, index=test_df.index)
+
+
+def auc_intervals(
+    scores: pd.DataFrame,
+    n_boot: int = N_BOOT,
+    by_month: bool = False
+) -> pd.DataFrame:
+    """
+    Test AUCs and the AUC gain with bootstrap confidence intervals.
+
+    Replicates resample test loans within regime (and issue month if
+    by_month) and re-rank the same PDs, so no model is refit. They run
+    on cells of loans with the same strata, default flag and PD bucket
+    under both models, so each costs O(cells), not O(loans). Estimates
+    are the exact loan-level AUCs. n_boot=0 gives point estimates only.
+    """
+    y = scores["default"].to_numpy()
+    strata = [scores["regime"].to_numpy()]
+    if by_month:
+        strata.append(month_ordinal(scores["issue_month"]))
+    buckets = [
+        pd_bucket(scores[column], AUC_PD_BUCKETS) for column in ("baseline_pd", "regime_pd")
+    ]
+    _, first, sizes = loan_cells(*strata, y, *buckets)
+
+    baseline_auc = RankAUC(y[first], buckets[0][first])
+    regime_auc = RankAUC(y[first], buckets[1][first])
+
+    results = bootstrap_ci(
+        {
+            "Baseline PD AUC": baseline_auc,
+            "Regime-aware PD AUC": regime_auc,
+            "AUC gain (regime-aware - baseline)": Difference(regime_auc, baseline_auc),
+        },
+        strata=strata_codes(*[key[first] for key in strata]),
+        sizes=sizes,
+        n_boot=n_boot,
+    )
+
+    exact = [rank_auc(y, scores["baseline_pd"]), rank_auc(y, scores["regime_pd"])]
+    results["estimate"] = np.array(exact + [exact[1] - exact[0]])
+    return results
@@ -0,0 +1,135 @@
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.cache import load_loan_panel
+from src.data.dates import NAT_MONTH, month_end, month_ordinal
+from src.data.split import time_based_split
+from src.features.monthly_cache import MonthlyTrainingCache
+from src.features.schema import FeatureSchema
+from src.models.baseline_pd import train_logistic_pd
+from src.models.regime_pd import train_regime_interaction_pd
+from src.models.registry import (
+    ModelArtifact,
+    data_fingerprint,
+    load_latest_model,
+    load_model,
+    save_model,
+)
+from src.regimes.regime_labels import regime_rule
+
+
+def _previous_model(name: str, columns) -> Optional[object]:
+    """
+    Latest stored model for name, if it was fit on the same columns.
+    """
+    try:
+        artifact = load_latest_model(name)
+    except FileNotFoundError:
+        return None
+    if artifact.feature_columns != list(columns):
+        return None
+    return artifact.model
+
+
+def refit_incremental(
+    name: str,
+    X: pd.DataFrame,
+    y: pd.Series,
+    train_fn,
+    schema: FeatureSchema,
+    regime_rule: Optional[str] = None,
+    **fit_kwargs
+) -> ModelArtifact:
+    """
+    Fit train_fn on (X, y) warm-started from the latest stored model.
+
+    Stored under the same fingerprint load_or_train would use, so an
+    unchanged training window and regime_rule is a registry hit. The
+    warm-started fit matches a cold fit on the same window up to solver
+    tolerance, not exactly.
+    """
+    fingerprint = data_fingerprint(X, y, train_fn, **fit_kwargs)
+
+    artifact = load_model(name, fingerprint)
+    if (
+        artifact is not None
+        and artifact.feature_columns == list(X.columns)
+        and artifact.regime_rule == regime_rule
+    ):
+        print(f"Model cache hit: {name} ({fingerprint[:16]})")
+        return artifact
+
+    previous = _previous_model(name, X.columns)
+    start = time.perf_counter()
+    model = train_fn(X, y, warm_start_from=previous, **fit_kwargs)
+    print(f"Refit {name} ({'warm' if previous is not None else 'cold'} start, "
+          f"{int(model.n_iter_[0])} iterations, {time.perf_counter() - start:.2f}s)")
+
+    return save_model(name, model, X, fingerprint, schema=schema, regime_rule=regime_rule)
+
+
+def latest_complete_month(issue_month) -> pd.Timestamp:
+    """
+    Month end of the latest issue month that has already ended, so a
+    vintage still being issued this month is not trained on.
+    """
+    months = month_ordinal(issue_month)
+    current = month_ordinal([pd.Timestamp.today()])[0]
+    complete = months[(months != NAT_MONTH) & (months < current)]
+    if len(complete) == 0:
+        raise ValueError("No complete issue month in the panel")
+    return month_end([np.max(complete)])[0]
+
+
+def main(train_end_date: Optional[str] = None, unemployment_threshold: float = 6.0):
+    """
+    Refit the baseline and regime PD models after new monthly vintages.
+
+    Training runs up to train_end_date, by default the latest complete
+    issue month in the panel, so each new vintage is appended. The schema stays frozen at the one stored with the latest baseline
+    model (fit on the panel's training window if there is none), so the
+    features of months already cached never change; only new or
+    restated months are built, and both models start from their last
+    stored coefficients.
+    """
+    panel = load_loan_panel(unemployment_threshold=unemployment_threshold)
+    if train_end_date is None:
+        train_end_date = str(latest_complete_month(panel["issue_month"]).date())
+    print(f"Training window ends: {train_end_date}")
+    train, _ = time_based_split(panel, train_end_date=train_end_date)
+
+    try:
+        schema = load_latest_model("baseline_pd").schema
+    except FileNotFoundError:
+        schema = None
+    if schema is None:
+        schema = FeatureSchema.fit(train)
+
+    cache = MonthlyTrainingCache(schema)
+    start = time.perf_counter()
+    built = cache.update(train)
+    print(f"Training months built: {len(built)} ({time.perf_counter() - start:.2f}s)")
+
+    X, y, regime = cache.load(end=train_end_date[:7])
+    print(f"Training loans: {len(y):,}")
+
+    refit_incremental("baseline_pd", X, y, train_logistic_pd, schema)
+    refit_incremental(
+        "regime_pd", X, y, train_regime_interaction_pd, schema,
+        regime_rule=regime_rule(unemployment_threshold), regime=regime
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--train-end-date", default=None,
+        help="Last issue date to train on (default: latest complete month)"
+    )
+    parser.add_argument("--unemployment-threshold", type=float, default=6.0)
+    args = parser.parse_args()
+    main(args.train_end_date, args.unemployment_threshold)
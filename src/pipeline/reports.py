@@ -0,0 +1,206 @@
+import argparse
+import time
+from pathlib import Path
+
+import matplotlib
+from joblib import Parallel, delayed
+
+from src.models.bootstrap import N_BOOT
+from src.pipeline import run_all
+from src.pipeline.stages import build_pipeline
+from src.regimes.regime_labels import RegimeSpec
+from src.reporting import (
+    figure_4_combined_pd_proof,
+    figure_5_selection_vs_risk,
+    plot_data_and_regimes,
+    portfolio_loss,
+    regime_risk_summary,
+    slice_metrics,
+)
+from src.reporting.style import set_plot_style
+
+
+# Text reports: run in the main process, on the shared pipeline
+SUMMARIES = {
+    "model_auc": run_all.main,
+    "regime_risk_summary": regime_risk_summary.main,
+    "slice_metrics": slice_metrics.main,
+    "portfolio_loss": portfolio_loss.main,
+}
+
+# Summaries with bootstrap intervals (take n_boot)
+BOOTSTRAP_SUMMARIES = {"model_auc", "regime_risk_summary"}
+
+
+def _figure_1(pipeline):
+    set_plot_style()
+    plot_data_and_regimes.plot_train_test_timeline(pipeline.get("cube"))
+
+
+def _figure_2(pipeline):
+    set_plot_style()
+    plot_data_and_regimes.plot_macro_regimes(pipeline.get("macro"))
+
+
+def _figure_3(pipeline):
+    set_plot_style()
+    plot_data_and_regimes.plot_default_rate_by_regime(pipeline.get("cube"))
+
+
+def _figure_4(pipeline):
+    figure_4_combined_pd_proof.plot_combined_pd_distribution(pipeline.get("cube"))
+
+
+def _figure_5(pipeline):
+    figure_5_selection_vs_risk.plot_selection_vs_risk(pipeline.get("cube"))
+
+
+# Figure name -> (renderer, persisted stages it reads)
+FIGURES = {
+    "figure_1": (_figure_1, ["cube"]),
+    "figure_2": (_figure_2, ["macro"]),
+    "figure_3": (_figure_3, ["cube"]),
+    "figure_4": (_figure_4, ["cube"]),
+    "figure_5": (_figure_5, ["cube"]),
+}
+
+REPORTS = [*SUMMARIES, *FIGURES]
+
+# Run only when named: the loss simulation draws N_PATHS paths over
+# every scored loan, minutes on the full panel
+OPT_IN = {"portfolio_loss"}
+DEFAULT_REPORTS = [name for name in REPORTS if name not in OPT_IN]
+
+
+def _render(name: str, pipeline) -> float:
+    start = time.perf_counter()
+    FIGURES[name][0](pipeline)
+    return time.perf_counter() - start
+
+
+def _render_in_worker(name: str, pipeline_kwargs: dict) -> float:
+    """
+    Render one figure in a worker process.
+
+    The stages it needs were persisted by the parent, so the worker's
+    own pipeline only memory-maps them from the stage store.
+    """
+    matplotlib.use("Agg")
+    return _render(name, build_pipeline(**pipeline_kwargs))
+
+
+def build_reports(
+    names=None,
+    n_jobs: int = -1,
+    n_boot: int = N_BOOT,
+    **pipeline_kwargs
+) -> dict:
+    """
+    Run the selected reports (all by default) from one stage graph.
+
+    Shared stages (panel, baseline model, report cube) are computed
+    once in this process. Summaries then run here; figures render
+    concurrently in a joblib process pool with the Agg backend, or
+    in-process one after another when n_jobs == 1.
+
+    Parameters
+    ----------
+    names : list of str, optional
+        Subset of REPORTS (default DEFAULT_REPORTS, i.e. all but the
+        opt-in ones)
+    n_jobs : int
+        Figure worker processes (-1 = all cores, 1 = sequential)
+    n_boot : int
+        Bootstrap replicates for the AUC and relative PD intervals
+        (0 = point estimates only)
+    **pipeline_kwargs
+        Passed to build_pipeline (paths, threshold, extra_series,
+        regime_spec, store_dir)
+
+    Returns
+    -------
+    dict
+        Seconds per report, plus "stages" and "total" wall time
+    """
+    names = list(names or DEFAULT_REPORTS)
+    start = time.perf_counter()
+    pipeline = build_pipeline(**pipeline_kwargs)
+    timings = {}
+
+    figures = [n for n in names if n in FIGURES]
+    needed = sorted({s for n in figures for s in FIGURES[n][1]})
+    pipeline.run(needed)
+    timings["stages"] = time.perf_counter() - start
+
+    for name in (n for n in names if n in SUMMARIES):
+        t0 = time.perf_counter()
+        print(f"\n=== {name} ===")
+        if name in BOOTSTRAP_SUMMARIES:
+            SUMMARIES[name](pipeline, n_boot=n_boot)
+        else:
+            SUMMARIES[name](pipeline)
+        timings[name] = time.perf_counter() - t0
+
+    if n_jobs == 1:
+        for name in figures:
+            timings[name] = _render(name, pipeline)
+    elif figures:
+        seconds = Parallel(n_jobs=n_jobs)(
+            delayed(_render_in_worker)(name, pipeline_kwargs) for name in figures
+        )
+        timings.update(zip(figures, seconds))
+
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build all figures and summaries from shared pipeline stages."
+    )
+    parser.add_argument("reports", nargs="*",
+                        help=f"Subset of {REPORTS}; {sorted(OPT_IN)} only run when named")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--n-boot", type=int, default=N_BOOT,
+                        help="Bootstrap replicates (0 = point estimates only)")
+    parser.add_argument("--unemployment-threshold", type=float, default=6.0)
+    parser.add_argument("--extra-series", type=Path, nargs="*", default=[],
+                        help="Further FRED CSV downloads attached to the panel")
+    parser.add_argument("--regime-column", default="unemployment_rate",
+                        help="Macro series cut by --regime-thresholds/--regime-quantiles")
+    parser.add_argument("--regime-thresholds", type=float, nargs="+")
+    parser.add_argument("--regime-quantiles", type=float, nargs="+")
+    parser.add_argument("--regime-labels", nargs="+",
+                        help="State names, lowest state first")
+    args = parser.parse_args()
+
+    unknown = [r for r in args.reports if r not in REPORTS]
+    if unknown:
+        parser.error(f"unknown reports: {unknown}")
+
+    regime_spec = None
+    if args.regime_thresholds or args.regime_quantiles:
+        regime_spec = RegimeSpec(
+            column=args.regime_column,
+            thresholds=args.regime_thresholds,
+            quantiles=args.regime_quantiles,
+            labels=args.regime_labels,
+        )
+
+    matplotlib.use("Agg")
+    timings = build_reports(
+        args.reports,
+        n_jobs=args.n_jobs,
+        n_boot=args.n_boot,
+        unemployment_threshold=args.unemployment_threshold,
+        extra_series=args.extra_series,
+        regime_spec=regime_spec
+    )
+
+    print("\nReport timings (s):")
+    for name, seconds in timings.items():
+        print(f"  {name:<22} {seconds:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
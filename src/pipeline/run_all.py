@@ -1,60 +1,66 @@
-import warnings
-from sklearn.exceptions import ConvergenceWarning
+import pandas as pd
 
-from src.config.paths import RAW_DATA
-
-from src.data.load import load_lendingclub, load_fred_macro
-from src.data.clean import clean_lendingclub
-from src.data.merge_macro import merge_loans_with_macro
 from src.data.split import time_based_split
 
-from src.features.build_features import build_features
-from src.regimes.regime_labels import assign_macro_regime
-
-from src.models.baseline_pd import train_logistic_pd, evaluate_pd
-from src.models.regime_pd import (
-    prepare_regime_features,
-    train_regime_aware_pd,
-    evaluate_pd as evaluate_regime_pd
+from src.models.bootstrap import N_BOOT
+from src.pipeline.evaluation import (
+    TRAIN_END_DATE,
+    auc_intervals,
+    fit_test_baseline,
+    fit_test_regime_model,
+    score_test_loans,
+    split_features,
 )
+from src.pipeline.stages import build_pipeline
+
+
+def evaluate_models(
+    loans_macro,
+    n_boot: int = N_BOOT,
+    by_month: bool = False,
+    unemployment_threshold: float = 6.0
+) -> pd.DataFrame:
+    """
+    Fit baseline and regime-aware PD models on the panel; return test
+    AUCs and the AUC gain with bootstrap confidence intervals.
+    unemployment_threshold is the rule the panel's regimes came from,
+    stored with the regime model.
+
+    The same steps as the split -> test_features -> test_baseline /
+    regime_model -> test_scores stages, run directly on a panel; see
+    auc_intervals for the bootstrap. n_boot=0 gives point estimates only.
+    """
+    # Time split
+    split = time_based_split(loans_macro, train_end_date=TRAIN_END_DATE)
 
+    # Features: one frozen schema, so test dummies and imputation means
+    # come from the training data
+    features = split_features(split)
 
-def main():
-    # Silence convergence warnings (expected at baseline stage)
-    warnings.filterwarnings("ignore", category=ConvergenceWarning)
-
-    # Load & prepare data
-    loans_raw = load_lendingclub(RAW_DATA / "lendingclub.csv")
-    loans_clean = clean_lendingclub(loans_raw)
-
-    macro = load_fred_macro(RAW_DATA / "fred_macro.csv")
-    loans_macro = merge_loans_with_macro(loans_clean, macro)
-    loans_macro = assign_macro_regime(loans_macro, unemployment_threshold=6.0)
-
-    # Time split
-    train_df, test_df = time_based_split(
-        loans_macro,
-        train_end_date="2016-12-31"
-    )
+    # Baseline PD, and regime-aware PD (interaction terms kept implicit)
+    regime_model = fit_test_regime_model(split, features, unemployment_threshold)
+    scores = score_test_loans(split, features, fit_test_baseline(features), regime_model)
 
-    # Features
-    X_train, y_train = build_features(train_df)
-    X_test, y_test = build_features(test_df)
+    # AUCs with stratified bootstrap intervals
+    return auc_intervals(scores, n_boot=n_boot, by_month=by_month)
 
-    # Baseline PD
-    baseline_model = train_logistic_pd(X_train, y_train)
-    baseline_auc = evaluate_pd(baseline_model, X_test, y_test)
 
-    # Regime-aware PD
-    X_train_reg = prepare_regime_features(X_train, train_df["regime"])
-    X_test_reg = prepare_regime_features(X_test, test_df["regime"])
+def main(pipeline=None, n_boot: int = N_BOOT):
+    # Test-period PDs of both models (memoized pipeline stages)
+    if pipeline is None:
+        pipeline = build_pipeline(unemployment_threshold=6.0)
+    scores = pipeline.get("test_scores")
 
-    regime_model = train_regime_aware_pd(X_train_reg, y_train)
-    regime_auc = evaluate_regime_pd(regime_model, X_test_reg, y_test)
+    results = auc_intervals(scores, n_boot=n_boot)
 
     # Final output only
-    print(f"Baseline PD AUC: {baseline_auc:.4f}")
-    print(f"Regime-aware PD AUC: {regime_auc:.4f}")
+    for name, row in results.iterrows():
+        line = f"{name}: {row['estimate']:.4f}"
+        if n_boot:
+            line += f" (95% CI {row['ci_low']:.4f} to {row['ci_high']:.4f})"
+        print(line)
+    if n_boot:
+        print(f"({n_boot} bootstrap replicates of the test loans, stratified by regime)")
 
 
 if __name__ == "__main__":
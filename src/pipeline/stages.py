@@ -0,0 +1,144 @@
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.config.paths import RAW_DATA
+from src.data.cache import (
+    PANEL_CHUNKSIZE, label_panel_regimes, panel_cache_path, save_loan_panel
+)
+from src.data.clean import clean_lendingclub
+from src.data.load import load_fred_macro, load_lendingclub
+from src.data.merge_macro import merge_loans_with_macro
+from src.data.split import time_based_split
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+from src.models.baseline_pd import train_logistic_pd
+from src.models.registry import load_or_train
+from src.pipeline.dag import STAGE_STORE, Pipeline
+from src.pipeline.evaluation import (
+    TRAIN_END_DATE,
+    fit_test_baseline,
+    fit_test_regime_model,
+    score_test_loans,
+    split_features,
+)
+from src.regimes.regime_labels import RegimeSpec
+from src.reporting.cube import build_report_cube
+
+
+def complete_cases(
+    panel: pd.DataFrame,
+    features: Tuple[pd.DataFrame, pd.Series]
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series]:
+    """
+    Panel rows, features and target restricted to loans with no
+    missing feature values.
+    """
+    X, y = features
+    mask = X.notnull().all(axis=1)
+    return panel.loc[mask], X.loc[mask], y.loc[mask]
+
+
+def fit_baseline(complete: tuple, schema: FeatureSchema):
+    """
+    Baseline PD model on the complete cases (stored in the registry).
+
+    This fit covers the whole panel, test period included, so it is
+    stored as "baseline_pd_panel": "baseline_pd" stays the train-window
+    model that scoring and the incremental refit load as the latest.
+    """
+    _, X, y = complete
+    return load_or_train(
+        "baseline_pd_panel", X, y, train_logistic_pd, schema=schema
+    ).model
+
+
+def score_panel(complete: tuple, model) -> pd.DataFrame:
+    """
+    Complete-case panel with the baseline PD as pd_hat.
+    """
+    loans, X, _ = complete
+    return loans.assign(pd_hat=model.predict_proba(X)[:, 1])
+
+
+def build_pipeline(
+    loans_path: Path = RAW_DATA / "lendingclub.csv",
+    macro_path: Path = RAW_DATA / "fred_macro.csv",
+    unemployment_threshold: float = 6.0,
+    extra_series: Sequence[Path] = (),
+    regime_spec: Optional[RegimeSpec] = None,
+    store_dir: Path = STAGE_STORE
+) -> Pipeline:
+    """
+    Stage graph shared by run_all and the reporting scripts.
+
+    Stages
+    ------
+    macro
+    loans_raw -> loans_clean -> (+ macro) loans_macro -> (+ macro) panel
+    panel -> schema -> features -> complete -> baseline_model -> scored
+    panel + scored -> cube
+    panel -> split -> test_features -> test_baseline, regime_model
+    split + test_features + test_baseline + regime_model -> test_scores
+
+    Each step of load_loan_panel (load, clean, merge, regime labels) is
+    its own stage. The panel is persisted at load_loan_panel's cache
+    path, so the stage graph and the scripts that call load_loan_panel
+    directly share one Parquet panel, and a hit skips the raw CSV. macro,
+    scored, the report cube and test_scores are persisted in the stage
+    store, so a second process (or a figure worker) reuses them without
+    refitting; figures only read the cube, model_auc the test scores.
+    The two models are also stored in the registry.
+
+    extra_series (further FRED downloads) and regime_spec (N-state
+    regimes instead of the threshold rule) reach the macro table and
+    the panel, and are part of every downstream stage key.
+    """
+    pipeline = Pipeline(store_dir)
+
+    extra_series = tuple(extra_series)
+    pipeline.add(
+        "macro", load_fred_macro,
+        inputs={"path": macro_path, "extra_series": extra_series}, persist=True
+    )
+    pipeline.add(
+        "loans_raw", load_lendingclub,
+        inputs={"path": loans_path}, params={"chunksize": PANEL_CHUNKSIZE}
+    )
+    pipeline.add("loans_clean", clean_lendingclub, deps=["loans_raw"])
+    pipeline.add("loans_macro", merge_loans_with_macro, deps=["loans_clean", "macro"])
+
+    settings = {
+        "unemployment_threshold": float(unemployment_threshold),
+        "regime_spec": regime_spec,
+    }
+    pipeline.add(
+        "panel", label_panel_regimes, deps=["loans_macro", "macro"], params=settings,
+        path=panel_cache_path(loans_path, macro_path, extra_series=extra_series, **settings),
+        writer=save_loan_panel,
+    )
+
+    pipeline.add("schema", FeatureSchema.fit, deps=["panel"])
+    pipeline.add("features", build_features, deps=["panel", "schema"])
+    pipeline.add("complete", complete_cases, deps=["panel", "features"])
+    pipeline.add("baseline_model", fit_baseline, deps=["complete", "schema"])
+    pipeline.add(
+        "scored", score_panel, deps=["complete", "baseline_model"], persist=True
+    )
+    pipeline.add("cube", build_report_cube, deps=["panel", "scored"], persist=True)
+
+    pipeline.add(
+        "split", time_based_split, deps=["panel"], params={"train_end_date": TRAIN_END_DATE}
+    )
+    pipeline.add("test_features", split_features, deps=["split"])
+    pipeline.add("test_baseline", fit_test_baseline, deps=["test_features"])
+    pipeline.add(
+        "regime_model", fit_test_regime_model, deps=["split", "test_features"], params=settings
+    )
+    pipeline.add(
+        "test_scores", score_test_loans,
+        deps=["split", "test_features", "test_baseline", "regime_model"], persist=True
+    )
+
+    return pipeline
@@ -0,0 +1,179 @@
+import argparse
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from src.data.cache import load_loan_panel
+from src.data.split import time_based_split
+from src.features.build_features import build_features
+from src.features.schema import FeatureSchema
+from src.models.baseline_pd import train_logistic_pd
+from src.models.metrics import rank_auc
+from src.models.regime_pd import REGIME_SOLVER, train_regime_interaction_pd
+from src.models.registry import load_or_train
+from src.models.solver import SolverConfig
+from src.regimes.regime_labels import label_regime
+
+
+DEFAULT_THRESHOLDS = np.round(np.arange(4.0, 9.01, 0.5), 2)
+
+
+def _relative_gap(values: np.ndarray, stress: np.ndarray) -> float:
+    """
+    Mean in Stress relative to mean in Expansion, minus one.
+    """
+    if stress.all() or not stress.any():
+        return np.nan
+    return values[stress].mean() / values[~stress].mean() - 1
+
+
+def _fit_threshold(
+    threshold: float,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    unemp_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    unemp_test: np.ndarray,
+    baseline_pd: np.ndarray,
+    columns: List[str],
+    config: SolverConfig
+) -> dict:
+    """
+    Relabel regimes at one threshold, fit and evaluate the regime model.
+    """
+    start = time.perf_counter()
+
+    regime_train = label_regime(pd.Series(unemp_train), threshold)
+    regime_test = label_regime(pd.Series(unemp_test), threshold)
+    stress_test = (regime_test == "Stress").to_numpy()
+
+    X_train = pd.DataFrame(X_train, columns=columns, copy=False)
+    X_test = pd.DataFrame(X_test, columns=columns, copy=False)
+
+    model = train_regime_interaction_pd(X_train, y_train, regime_train, config=config)
+    fit_seconds = time.perf_counter() - start
+
+    regime_pd = model.predict_proba(X_test, regime_test)[:, 1]
+
+    return {
+        "threshold": threshold,
+        "stress_share_train": float((regime_train == "Stress").mean()),
+        "stress_share_test": float(stress_test.mean()),
+        "baseline_auc": rank_auc(y_test, baseline_pd),
+        "regime_auc": rank_auc(y_test, regime_pd),
+        "baseline_pd_gap": _relative_gap(baseline_pd, stress_test),
+        "regime_pd_gap": _relative_gap(regime_pd, stress_test),
+        "observed_default_gap": _relative_gap(y_test.astype(float), stress_test),
+        "n_iter": int(model.n_iter_[0]),
+        "fit_seconds": fit_seconds,
+        "total_seconds": time.perf_counter() - start,
+    }
+
+
+def run_threshold_sweep(
+    loans_macro: pd.DataFrame,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    train_end_date: str = "2016-12-31",
+    n_jobs: int = -1,
+    config: SolverConfig = REGIME_SOLVER
+) -> pd.DataFrame:
+    """
+    Baseline vs regime-aware PD across unemployment thresholds.
+
+    The split, feature matrix and baseline model do not depend on the
+    threshold, so they are built once. Each threshold only relabels
+    regimes (a comparison on the unemployment column) and fits a
+    RegimeInteractionPD with the same solver settings as run_all, so the
+    row at the production threshold reproduces its AUCs; thresholds run
+    in parallel in a joblib process
+    pool, which memory-maps the shared feature arrays into the workers.
+
+    Parameters
+    ----------
+    loans_macro : pd.DataFrame
+        Loan panel with unemployment_rate
+    thresholds : sequence of float
+        Unemployment thresholds (%) to evaluate
+    train_end_date : str
+        Last issue date in the training window
+    n_jobs : int
+        Worker processes (-1 = all cores)
+    config : SolverConfig
+        Solver settings for each regime-aware fit
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per threshold: regime shares, test AUCs, relative
+        Stress-vs-Expansion gaps in mean PD and observed defaults, and
+        timings
+    """
+    train_df, test_df = time_based_split(loans_macro, train_end_date=train_end_date)
+
+    schema = FeatureSchema.fit(train_df)
+    X_train, y_train = build_features(train_df, schema)
+    X_test, y_test = build_features(test_df, schema)
+    X_train = schema.impute(X_train)
+    X_test = schema.impute(X_test)
+
+    baseline = load_or_train(
+        "baseline_pd", X_train, y_train, train_logistic_pd, schema=schema
+    ).model
+    baseline_pd = baseline.predict_proba(X_test)[:, 1]
+
+    columns = list(X_train.columns)
+    # unemployment_rate is float32 on the panel; labels are compared in
+    # that precision, as assign_macro_regime does
+    shared = dict(
+        X_train=X_train.to_numpy(dtype=np.float64),
+        y_train=y_train.to_numpy(dtype=np.float64),
+        unemp_train=train_df["unemployment_rate"].to_numpy(),
+        X_test=X_test.to_numpy(dtype=np.float64),
+        y_test=y_test.to_numpy(dtype=np.float64),
+        unemp_test=test_df["unemployment_rate"].to_numpy(),
+        baseline_pd=baseline_pd,
+        columns=columns,
+        config=config,
+    )
+
+    rows = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_threshold)(float(t), **shared) for t in thresholds
+    )
+
+    return pd.DataFrame(rows).set_index("threshold")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep the unemployment threshold used to define regimes."
+    )
+    parser.add_argument("--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS))
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument(
+        "--output", type=Path, default=Path("reports/tables/threshold_sweep.csv")
+    )
+    args = parser.parse_args()
+
+    loans_macro = load_loan_panel()
+
+    start = time.perf_counter()
+    results = run_threshold_sweep(loans_macro, args.thresholds, n_jobs=args.n_jobs)
+    wall = time.perf_counter() - start
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(args.output)
+
+    with pd.option_context("display.width", 160):
+        print(results.round(4))
+    print(f"\nSweep of {len(results)} thresholds: {wall:.1f}s wall, "
+          f"{results['total_seconds'].sum():.1f}s summed over configurations")
+    print(f"Saved table: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import hashlib
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.config.paths import PROCESSED_DATA
+from src.data.dates import NAT_MONTH, month_ordinal
+from src.data.merge_macro import macro_row_index
+from src.regimes.regime_labels import REGIME_LABELS
+
+
+MARKOV_CACHE_DIR = PROCESSED_DATA / "markov_switching"
+
+# Bump whenever the fit or the stored fields change
+MARKOV_CACHE_VERSION = 3
+
+
+@dataclass
+class MarkovRegimes:
+    """
+    Fitted Markov-switching regimes of one monthly macro series.
+
+    States are ordered by their mean level, lowest first, and named
+    like label_states (Expansion/Stress for two states). Parameters are
+    estimated on the months up to fit_end (all months if None) and then
+    run over the whole series. probabilities are the smoothed
+    P(state | whole series) per month, which use information from after
+    each month: use them to describe history. filtered are
+    P(state | series up to that month), which is what regime_weights
+    gives loans as of issue.
+    """
+    key: str
+    labels: List[str]
+    probabilities: pd.DataFrame
+    filtered: pd.DataFrame
+    fit_end: Optional[str]
+    means: Dict[str, float]
+    variances: Dict[str, float]
+    transition: pd.DataFrame
+    llf: float
+    fit_seconds: float
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+    def most_likely(self) -> pd.Series:
+        """
+        Most probable state per month, as an int8-coded categorical.
+        """
+        codes = self.probabilities.to_numpy().argmax(axis=1).astype(np.int8)
+        return pd.Series(
+            pd.Categorical.from_codes(codes, self.labels),
+            index=self.probabilities.index,
+            name="regime"
+        )
+
+
+def series_key(
+    series: pd.Series,
+    k_regimes: int,
+    switching_variance: bool,
+    fit_end: Optional[str] = None
+) -> str:
+    """
+    Hash of the series (months and values) and the model settings.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update(f"markov-v{MARKOV_CACHE_VERSION}|k{k_regimes}|sv{switching_variance}"
+             f"|end{fit_end}".encode())
+    h.update(month_ordinal(series.index).tobytes())
+    h.update(np.asarray(series, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def _start_params(model, y: np.ndarray, k_regimes: int) -> np.ndarray:
+    """
+    Deterministic starting values: state means at evenly spaced
+    quantiles of y, equal variances, persistent states. statsmodels'
+    defaults can end in a degenerate zero-variance state on a slowly
+    moving series such as the unemployment rate.
+    """
+    start = pd.Series(model.start_params, index=model.param_names)
+    for name in start.index:
+        if name.startswith("p["):
+            i, j = name[2:-1].split("->")
+            start[name] = 0.9 if i == j else 0.1 / (k_regimes - 1)
+        elif name.startswith("const["):
+            i = int(name[6:-1])
+            start[name] = np.quantile(y, (i + 0.5) / k_regimes)
+        elif name.startswith("sigma2"):
+            start[name] = y.var() / k_regimes
+    return start.to_numpy()
+
+
+def _fit(
+    series: pd.Series,
+    k_regimes: int,
+    switching_variance: bool,
+    fit_end: Optional[str],
+    key: str
+) -> MarkovRegimes:
+    # statsmodels is only imported when a fit is actually needed
+    from statsmodels.tsa.regime_switching.markov_regression import MarkovRegression
+
+    y = np.asarray(series, dtype=np.float64)
+    n_fit = len(y) if fit_end is None else int((series.index <= fit_end).sum())
+    if n_fit < 2 * k_regimes:
+        raise ValueError(f"Only {n_fit} months up to {fit_end} to fit {k_regimes} states")
+
+    start = time.perf_counter()
+    model = MarkovRegression(
+        y[:n_fit], k_regimes=k_regimes, trend="c", switching_variance=switching_variance
+    )
+    fitted = model.fit(start_params=_start_params(model, y[:n_fit], k_regimes), disp=False)
+
+    # Run the estimated model over every month: filtered probabilities
+    # of later months only use data up to each month
+    result = MarkovRegression(
+        y, k_regimes=k_regimes, trend="c", switching_variance=switching_variance
+    ).smooth(fitted.params)
+    fit_seconds = time.perf_counter() - start
+
+    params = pd.Series(fitted.params, index=model.param_names)
+    const = np.array([params[f"const[{i}]"] for i in range(k_regimes)])
+    sigma2 = np.array([
+        params[f"sigma2[{i}]"] if switching_variance else params["sigma2"]
+        for i in range(k_regimes)
+    ])
+
+    # statsmodels numbers states arbitrarily; order them by mean level
+    order = np.argsort(const)
+    labels = REGIME_LABELS if k_regimes == 2 else [f"state_{i}" for i in range(k_regimes)]
+
+    probabilities, filtered = (
+        pd.DataFrame(np.asarray(p)[:, order], index=series.index, columns=labels)
+        for p in (result.smoothed_marginal_probabilities,
+                  result.filtered_marginal_probabilities)
+    )
+    # regime_transition[i, j] = P(next = i | current = j)
+    transition = pd.DataFrame(
+        result.regime_transition[:, :, 0][np.ix_(order, order)].T,
+        index=pd.Index(labels, name="from"),
+        columns=pd.Index(labels, name="to"),
+    )
+
+    return MarkovRegimes(
+        key=key,
+        labels=list(labels),
+        probabilities=probabilities,
+        filtered=filtered,
+        fit_end=fit_end,
+        means=dict(zip(labels, const[order])),
+        variances=dict(zip(labels, sigma2[order])),
+        transition=transition,
+        llf=float(fitted.llf),
+        fit_seconds=fit_seconds,
+    )
+
+
+def fit_markov_regimes(
+    macro: pd.DataFrame,
+    column: str = "unemployment_rate",
+    k_regimes: int = 2,
+    switching_variance: bool = True,
+    fit_end: Optional[str] = None,
+    use_cache: bool = True
+) -> MarkovRegimes:
+    """
+    Fit (or load) a Markov-switching mean/variance model of one macro
+    series.
+
+    The model is fit once per series on the monthly macro table (a few
+    hundred rows), never on loans, and stored under MARKOV_CACHE_DIR
+    keyed by series_key: a second call with the same series and
+    settings loads the stored fit instead of re-running the EM/BFGS
+    optimisation.
+
+    Parameters
+    ----------
+    macro : pd.DataFrame
+        Monthly macro table with date column (load_fred_macro)
+    column : str
+        Series to model
+    k_regimes : int
+        Number of states
+    switching_variance : bool
+        Let the variance differ by state as well as the mean
+    fit_end : str, optional
+        Estimate the parameters on months up to this date only (e.g.
+        the training cutoff); all months if None
+    use_cache : bool
+        If False, always refit and skip writing
+
+    Returns
+    -------
+    MarkovRegimes
+    """
+    series = macro.set_index("date")[column].dropna().sort_index()
+    key = series_key(series, k_regimes, switching_variance, fit_end)
+    path = MARKOV_CACHE_DIR / f"{column}_{key}.joblib"
+
+    if use_cache and path.exists():
+        print(f"Markov-switching cache hit: {path.name}")
+        return joblib.load(path)
+
+    fitted = _fit(series, k_regimes, switching_variance, fit_end, key)
+
+    if use_cache:
+        MARKOV_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".joblib.tmp")
+        joblib.dump(fitted, tmp_path)
+        tmp_path.replace(path)
+        print(f"Saved Markov-switching fit: {path.name}")
+
+    return fitted
+
+
+def regime_weights(
+    loans: pd.DataFrame,
+    regimes: MarkovRegimes,
+    lag_months: int = 0
+) -> pd.DataFrame:
+    """
+    Per-loan filtered state probabilities, gathered from the monthly
+    table by issue month: each loan only sees the series up to its
+    (lagged) issue month.
+
+    The result (one column per state, aligned with loans.index) can be
+    passed as soft regime weights wherever a regime label Series is
+    taken: prepare_regime_features, RegimeInteractionPD. Loans whose
+    month was not modelled get NaN weights.
+    """
+    macro_months = month_ordinal(regimes.filtered.index)
+    loan_months = month_ordinal(loans["issue_month"])
+    if lag_months:
+        loan_months = np.where(
+            loan_months != NAT_MONTH, loan_months - lag_months, NAT_MONTH
+        ).astype(np.int32)
+    rows = macro_row_index(loan_months, macro_months)
+
+    probs = regimes.filtered.to_numpy()
+    weights = np.where(rows[:, None] >= 0, probs[np.maximum(rows, 0)], np.nan)
+    return pd.DataFrame(weights, index=loans.index, columns=regimes.labels)
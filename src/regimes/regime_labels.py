@@ -1,4 +1,13 @@
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from src.data.dates import NAT_MONTH, month_ordinal
+from src.data.merge_macro import macro_row_index
+
+
+REGIME_LABELS = ["Expansion", "Stress"]
 
 
 def assign_macro_regime(
@@ -18,12 +27,221 @@ def assign_macro_regime(
     Returns
     -------
     pd.DataFrame
-        Data with 'regime' column
+        Data with an int8-coded categorical 'regime' column (the input
+        is not modified). Loans without a rate count as Expansion.
     """
-    df = df.copy()
+    # Shallow copy: only the new column is allocated
+    df = df.copy(deep=False)
 
-    df["regime"] = (
-        df["unemployment_rate"] > unemployment_threshold
-    ).map({True: "Stress", False: "Expansion"})
+    # One int8 comparison per loan, cheaper than gathering the label
+    # through issue_month codes. N-state labels
+    # go through label_macro_regimes + broadcast_regime instead.
+    df["regime"] = label_regime(df["unemployment_rate"], unemployment_threshold)
 
     return df
+
+
+def label_regime(
+    unemployment_rate: pd.Series,
+    unemployment_threshold: float = 6.0
+) -> pd.Series:
+    """
+    Stress/Expansion label as a compact categorical.
+
+    Same rule as assign_macro_regime, but returns int8-coded categories
+    instead of a column of strings, which makes relabelling cheap when
+    many thresholds are evaluated on the same panel.
+    """
+    stress = np.asarray(unemployment_rate > unemployment_threshold, dtype=np.int8)
+    return pd.Series(
+        pd.Categorical.from_codes(stress, REGIME_LABELS),
+        index=unemployment_rate.index,
+        name="regime"
+    )
+
+
+def regime_cuts(
+    values,
+    thresholds: Optional[Sequence[float]] = None,
+    quantiles: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """
+    Increasing cut points for N-state regimes: the given thresholds, or
+    the given quantiles of values (missing values ignored).
+    """
+    if (thresholds is None) == (quantiles is None):
+        raise ValueError("Pass exactly one of thresholds or quantiles")
+
+    if quantiles is not None:
+        cuts = np.nanquantile(np.asarray(values, dtype=np.float64), quantiles)
+    else:
+        cuts = np.asarray(thresholds, dtype=np.float64)
+
+    if len(cuts) == 0 or np.any(np.diff(cuts) <= 0):
+        raise ValueError(f"Cut points must be non-empty and strictly increasing: {cuts}")
+    return cuts
+
+
+def label_states(
+    values,
+    thresholds: Optional[Sequence[float]] = None,
+    quantiles: Optional[Sequence[float]] = None,
+    labels: Optional[Sequence[str]] = None
+) -> pd.Series:
+    """
+    N-state regime labels from thresholds or quantiles.
+
+    k cut points give k + 1 states; a value above the i-th cut (and at
+    or below the next) is in state i, so one threshold reproduces the
+    Stress/Expansion rule. Codes are int8.
+
+    Parameters
+    ----------
+    values : array-like
+        Macro series, e.g. the unemployment rate per month
+    thresholds : sequence of float, optional
+        Increasing cut points
+    quantiles : sequence of float, optional
+        Cut at these quantiles of values instead
+    labels : sequence of str, optional
+        State names, lowest first; REGIME_LABELS for two states,
+        otherwise state_0, state_1, ...
+
+    Returns
+    -------
+    pd.Series
+        Categorical regime per value; missing values get no state
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    values = np.asarray(values, dtype=np.float64)
+    cuts = regime_cuts(values, thresholds, quantiles)
+
+    if labels is None:
+        labels = REGIME_LABELS if len(cuts) == 1 else [f"state_{i}" for i in range(len(cuts) + 1)]
+    if len(labels) != len(cuts) + 1:
+        raise ValueError(f"{len(cuts)} cut points need {len(cuts) + 1} labels, got {len(labels)}")
+
+    codes = np.searchsorted(cuts, values, side="left").astype(np.int8)
+    codes[np.isnan(values)] = -1
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, list(labels)),
+        index=index,
+        name="regime"
+    )
+
+
+def label_macro_regimes(
+    macro: pd.DataFrame,
+    column: str = "unemployment_rate",
+    thresholds: Optional[Sequence[float]] = None,
+    quantiles: Optional[Sequence[float]] = None,
+    labels: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Label every month of the macro table (quantiles are taken over
+    months, not loans).
+
+    Returns
+    -------
+    pd.DataFrame
+        macro with a categorical 'regime' column
+    """
+    regime = label_states(macro[column], thresholds, quantiles, labels)
+    return macro.assign(regime=regime.array)
+
+
+def broadcast_regime(
+    loans: pd.DataFrame,
+    macro: pd.DataFrame,
+    lag_months: int = 0
+) -> pd.DataFrame:
+    """
+    Attach the macro table's regime to loans by issue month.
+
+    The regime codes of the (one row per month) macro table are gathered
+    once per loan through integer month indices; no labelling happens at
+    loan level.
+
+    Parameters
+    ----------
+    loans : pd.DataFrame
+        Loans with issue_month
+    macro : pd.DataFrame
+        Output of label_macro_regimes
+    lag_months : int
+        Take the regime from this many months before issue
+
+    Returns
+    -------
+    pd.DataFrame
+        loans with a categorical 'regime' column; loans whose month has
+        no macro row get no regime
+    """
+    macro_months = month_ordinal(macro["date"])
+    order = np.argsort(macro_months, kind="stable")
+
+    loan_months = month_ordinal(loans["issue_month"])
+    if lag_months:
+        loan_months = np.where(
+            loan_months != NAT_MONTH, loan_months - lag_months, NAT_MONTH
+        ).astype(np.int32)
+    rows = macro_row_index(loan_months, macro_months[order])
+
+    month_codes = macro["regime"].cat.codes.to_numpy()[order]
+    codes = np.where(rows >= 0, month_codes[np.maximum(rows, 0)], -1).astype(np.int8)
+
+    return loans.assign(
+        regime=pd.Categorical.from_codes(codes, macro["regime"].cat.categories)
+    )
+
+
+@dataclass(frozen=True)
+class RegimeSpec:
+    """
+    N-state regime definition for the loan panel.
+
+    States are cut on one macro series, at fixed thresholds or at
+    quantiles of its months, labelled on the monthly macro table and
+    broadcast to loans by issue month (label_macro_regimes +
+    broadcast_regime). Without a spec the panel uses the binary
+    unemployment threshold rule of assign_macro_regime.
+    """
+    column: str = "unemployment_rate"
+    thresholds: Optional[Tuple[float, ...]] = None
+    quantiles: Optional[Tuple[float, ...]] = None
+    labels: Optional[Tuple[str, ...]] = None
+    lag_months: int = 0
+
+    def __post_init__(self):
+        if (self.thresholds is None) == (self.quantiles is None):
+            raise ValueError("Pass exactly one of thresholds or quantiles")
+        # Tuples keep the spec hashable and its repr stable for cache keys
+        for name in ("thresholds", "quantiles", "labels"):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, tuple(value))
+
+    def apply(self, loans: pd.DataFrame, macro: pd.DataFrame) -> pd.DataFrame:
+        """
+        loans with the spec's categorical 'regime' column.
+        """
+        labelled = label_macro_regimes(
+            macro, self.column, self.thresholds, self.quantiles, self.labels
+        )
+        return broadcast_regime(loans, labelled, self.lag_months)
+
+
+def regime_rule(
+    unemployment_threshold: float = 6.0,
+    regime_spec: Optional[RegimeSpec] = None
+) -> str:
+    """
+    How a panel's regime column was labelled: the spec if one was
+    given (the threshold is then unused), else the binary threshold
+    rule. Stored with regime-aware models so that later users can check
+    they label loans the same way.
+    """
+    if regime_spec is not None:
+        return repr(regime_spec)
+    return f"unemployment_rate > {float(unemployment_threshold):g}"
@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+
+from src.data.dates import NAT_MONTH, month_end, month_ordinal
+
+
+# Fine PD buckets on [0, 1]; quantiles read from them are exact to
+# within one bucket width (0.002)
+PD_BUCKETS = 500
+
+# pd_bucket for loans without a model PD (incomplete features)
+NO_PD = -1
+
+CUBE_KEYS = ["regime", "issue_month", "grade", "pd_bucket"]
+
+
+def pd_bucket(pd_hat: pd.Series, n_buckets: int = PD_BUCKETS) -> np.ndarray:
+    """
+    Fine PD bucket per loan (int16); missing PDs map to NO_PD.
+    """
+    values = pd_hat.to_numpy(dtype=np.float64)
+    buckets = np.minimum(values * n_buckets, n_buckets - 1)
+    return np.where(np.isnan(values), NO_PD, buckets).astype(np.int16)
+
+
+def build_report_cube(
+    panel: pd.DataFrame,
+    scored: pd.DataFrame,
+    n_buckets: int = PD_BUCKETS
+) -> pd.DataFrame:
+    """
+    Aggregate the loan panel into the cube every report reads.
+
+    One groupby over (regime, issue month, grade, PD bucket) sums loan
+    counts, defaults and PDs. Figures and summaries are computed from
+    these few thousand cells, so the loan-level panel is only needed
+    while the cube is built.
+
+    Parameters
+    ----------
+    panel : pd.DataFrame
+        Loan panel with regime, issue_month, grade and default
+    scored : pd.DataFrame
+        Complete-case subset of panel (same index) with pd_hat
+    n_buckets : int
+        PD buckets on [0, 1]
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per non-empty cell: CUBE_KEYS plus n, defaults, pd_sum.
+        issue_month is a month ordinal (NAT_MONTH if undated); loans
+        without a PD have pd_bucket NO_PD and pd_sum 0.
+    """
+    pd_hat = scored["pd_hat"].reindex(panel.index)
+
+    cells = pd.DataFrame({
+        "regime": panel["regime"].astype("category"),
+        "issue_month": month_ordinal(panel["issue_month"]),
+        "grade": panel["grade"],
+        "pd_bucket": pd_bucket(pd_hat, n_buckets),
+        "n": np.ones(len(panel), dtype=np.int64),
+        "defaults": panel["default"].to_numpy(dtype=np.int64),
+        "pd_sum": pd_hat.fillna(0.0).to_numpy(),
+    }, index=panel.index)
+
+    cube = (
+        cells
+        .groupby(CUBE_KEYS, observed=True, dropna=False, sort=True)
+        .sum()
+        .reset_index()
+    )
+    cube.attrs["n_buckets"] = n_buckets
+    return cube
+
+
+def _month_range(ordinals) -> np.ndarray:
+    return np.arange(ordinals.min(), ordinals.max() + 1)
+
+
+def _scored(cube: pd.DataFrame) -> pd.DataFrame:
+    return cube[cube["pd_bucket"] != NO_PD]
+
+
+def monthly_counts(cube: pd.DataFrame) -> pd.Series:
+    """
+    Loans issued per month (month-end index, empty months as 0).
+    """
+    dated = cube[cube["issue_month"] != NAT_MONTH]
+    counts = dated.groupby("issue_month")["n"].sum()
+    counts = counts.reindex(_month_range(counts.index), fill_value=0)
+    counts.index = month_end(counts.index)
+    return counts
+
+
+def monthly_default_rate(cube: pd.DataFrame) -> pd.DataFrame:
+    """
+    Default rate by regime (rows) and month-end (columns); NaN where a
+    regime issued no loans that month.
+    """
+    dated = cube[cube["issue_month"] != NAT_MONTH]
+    totals = dated.groupby(["regime", "issue_month"], observed=True)[["n", "defaults"]].sum()
+
+    rate = (totals["defaults"] / totals["n"]).unstack("issue_month")
+    rate = rate.reindex(columns=_month_range(rate.columns))
+    rate.columns = month_end(rate.columns)
+    return rate
+
+
+def pd_histogram(cube: pd.DataFrame) -> pd.DataFrame:
+    """
+    Loan counts per regime (rows) and PD bucket (columns, all buckets).
+    """
+    n_buckets = cube.attrs.get("n_buckets", PD_BUCKETS)
+    return (
+        _scored(cube)
+        .groupby(["regime", "pd_bucket"], observed=True)["n"].sum()
+        .unstack("pd_bucket", fill_value=0)
+        .reindex(columns=range(n_buckets), fill_value=0)
+    )
+
+
+def bucket_centers(n_buckets: int = PD_BUCKETS) -> np.ndarray:
+    return (np.arange(n_buckets) + 0.5) / n_buckets
+
+
+def histogram_quantile(counts: np.ndarray, q: float) -> float:
+    """
+    q-quantile of PDs from bucket counts, interpolating linearly
+    within the bucket that holds it.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    cum = np.cumsum(counts)
+    target = q * cum[-1]
+
+    i = min(int(np.searchsorted(cum, target)), len(counts) - 1)
+    before = cum[i - 1] if i > 0 else 0.0
+    frac = (target - before) / counts[i] if counts[i] > 0 else 0.0
+    return (i + frac) / len(counts)
+
+
+def regime_summary(cube: pd.DataFrame, tail: float = 0.95) -> pd.DataFrame:
+    """
+    Mean PD, tail PD, observed default rate and sample size per regime
+    over loans with a model PD.
+    """
+    totals = _scored(cube).groupby("regime", observed=True)[["n", "defaults", "pd_sum"]].sum()
+    hist = pd_histogram(cube)
+
+    return pd.DataFrame({
+        "Mean PD": totals["pd_sum"] / totals["n"],
+        f"{tail:.0%} PD (Tail Risk)": [
+            histogram_quantile(hist.loc[r].to_numpy(), tail) for r in totals.index
+        ],
+        "Observed Default Rate": totals["defaults"] / totals["n"],
+        "Sample Size": totals["n"].astype(float),
+    })
+
+
+def pd_decile_table(cube: pd.DataFrame, q: int = 10) -> pd.DataFrame:
+    """
+    Loan count, portfolio share and default rate per regime and PD
+    decile (1 = lowest risk).
+
+    Deciles are pooled over regimes, as pd.qcut on all scored loans
+    would. A PD bucket that straddles a decile edge is split between
+    the two deciles in proportion to its rank overlap, so every pooled
+    decile holds exactly 1/q of the loans (sizes are therefore float).
+    """
+    scored = _scored(cube)
+
+    pooled = scored.groupby("pd_bucket")["n"].sum()
+    counts = pooled.to_numpy(dtype=np.float64)
+    upper = np.cumsum(counts)
+    lower = upper - counts
+    edges = np.arange(q + 1) * upper[-1] / q
+
+    # Share of each bucket's loans falling in each decile's rank range
+    overlap = (
+        np.minimum(upper[:, None], edges[None, 1:])
+        - np.maximum(lower[:, None], edges[None, :-1])
+    )
+    frac = pd.DataFrame(
+        np.clip(overlap, 0.0, None) / counts[:, None],
+        index=pooled.index,
+        columns=pd.Index(np.arange(1, q + 1), name="pd_decile")
+    ).stack()
+    frac = frac[frac > 0].rename("frac").reset_index()
+
+    split = scored.merge(frac, on="pd_bucket")
+    table = (
+        split
+        .assign(size=split["n"] * split["frac"], defaults=split["defaults"] * split["frac"])
+        .groupby(["regime", "pd_decile"], observed=True)[["size", "defaults"]].sum()
+        .reset_index()
+    )
+    table["share"] = table["size"] / table.groupby("regime")["size"].transform("sum")
+    table["default"] = table["defaults"] / table["size"]
+    return table
@@ -4,52 +4,29 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-from src.config.paths import RAW_DATA
-from src.data.load import load_lendingclub, load_fred_macro
-from src.data.clean import clean_lendingclub
-from src.data.merge_macro import merge_loans_with_macro
-from src.regimes.regime_labels import assign_macro_regime
-from src.features.build_features import build_features
-from src.models.baseline_pd import train_logistic_pd
+from src.pipeline.stages import build_pipeline
+from src.reporting.cube import bucket_centers, pd_histogram
 
 
 FIG_DIR = Path("reports/figures")
 FIG_DIR.mkdir(parents=True, exist_ok=True)
 
-sns.set_theme(style="white", context="paper", font_scale=1.2)
-
-
-def main():
-    # -------------------------
-    # Load & prepare data
-    # -------------------------
-    loans = load_lendingclub(RAW_DATA / "lendingclub.csv")
-    loans = clean_lendingclub(loans)
-
-    macro = load_fred_macro(RAW_DATA / "fred_macro.csv")
-    loans = merge_loans_with_macro(loans, macro)
-    loans = assign_macro_regime(loans)
-
-    X, y = build_features(loans)
-
-    # Drop rows with NaNs for modeling & prediction
-    mask = X.notnull().all(axis=1)
-    X_clean = X.loc[mask]
-    y_clean = y.loc[mask]
-    loans_clean = loans.loc[mask].copy()
-
-    model = train_logistic_pd(X_clean, y_clean)
-    loans_clean["pd_hat"] = model.predict_proba(X_clean)[:, 1]
 
+def plot_combined_pd_distribution(cube: pd.DataFrame):
+    """
+    PD distribution and observed default rate per regime, from the
+    report cube (loans with a model PD only).
+    """
+    sns.set_theme(style="white", context="paper", font_scale=1.2)
 
     # -------------------------
     # Compute observed defaults
     # -------------------------
-    observed = (
-        loans_clean.groupby("regime")["default"]
-        .mean()
-        .to_dict()
-    )
+    scored = cube[cube["pd_bucket"] >= 0].groupby("regime", observed=True)
+    observed = (scored["defaults"].sum() / scored["n"].sum()).to_dict()
+
+    hist = pd_histogram(cube)
+    centers = bucket_centers(hist.shape[1])
 
 
     # -------------------------
@@ -58,10 +35,10 @@ def main():
     plt.figure(figsize=(9, 6))
 
     for regime, color in zip(["Expansion", "Stress"], ["#1f77b4", "#d62728"]):
-        subset = loans_clean.loc[loans_clean["regime"] == regime, "pd_hat"]
-
+        # KDE of the fine PD histogram, weighted by loan counts
         sns.kdeplot(
-            subset,
+            x=centers,
+            weights=hist.loc[regime].to_numpy(),
             fill=True,
             linewidth=2,
             alpha=0.35,
@@ -96,5 +73,17 @@ def main():
     plt.close()
 
 
+def main(pipeline=None):
+    # -------------------------
+    # Load & prepare data
+    # -------------------------
+    # Aggregated panel with baseline PDs (rows with missing
+    # features have no PD bucket)
+    if pipeline is None:
+        pipeline = build_pipeline()
+
+    plot_combined_pd_distribution(pipeline.get("cube"))
+
+
 if __name__ == "__main__":
     main()
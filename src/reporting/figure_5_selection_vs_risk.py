@@ -4,81 +4,32 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-from src.config.paths import RAW_DATA
-from src.data.load import load_lendingclub, load_fred_macro
-from src.data.clean import clean_lendingclub
-from src.data.merge_macro import merge_loans_with_macro
-from src.regimes.regime_labels import assign_macro_regime
-from src.features.build_features import build_features
-from src.models.baseline_pd import train_logistic_pd
+from src.pipeline.stages import build_pipeline
+from src.reporting.cube import pd_decile_table
 
 
-# -------------------------------------------------
-# Style (journal / research)
-# -------------------------------------------------
-sns.set_theme(style="whitegrid", context="paper", font_scale=1.1)
-
 FIG_DIR = Path("reports/figures")
 FIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def main():
-    # -------------------------------------------------
-    # Load & prepare data
-    # -------------------------------------------------
-    loans = load_lendingclub(RAW_DATA / "lendingclub.csv")
-    loans = clean_lendingclub(loans)
-
-    macro = load_fred_macro(RAW_DATA / "fred_macro.csv")
-    loans = merge_loans_with_macro(loans, macro)
-    loans = assign_macro_regime(loans)
-
-    # -------------------------------------------------
-    # Build ML features & train logistic regression
-    # -------------------------------------------------
-    X, y = build_features(loans)
-    mask = X.notnull().all(axis=1)
-
-    loans = loans.loc[mask].copy()
-    X = X.loc[mask]
-    y = y.loc[mask]
-
-    model = train_logistic_pd(X, y)
-    loans["pd_hat"] = model.predict_proba(X)[:, 1]
-
+def plot_selection_vs_risk(cube: pd.DataFrame):
+    """
+    Risk composition and conditional default rates by PD decile, from
+    the report cube.
+    """
     # -------------------------------------------------
-    # Create PD deciles (risk buckets)
+    # Style (journal / research)
     # -------------------------------------------------
-    loans["pd_decile"] = pd.qcut(
-        loans["pd_hat"],
-        q=10,
-        labels=False
-    ) + 1  # 1 = lowest risk, 10 = highest risk
+    sns.set_theme(style="whitegrid", context="paper", font_scale=1.1)
 
     # -------------------------------------------------
-    # PANEL A: Portfolio risk composition
+    # PD deciles (1 = lowest risk, 10 = highest risk):
+    # PANEL A share of each regime's portfolio,
+    # PANEL B conditional default rate
     # -------------------------------------------------
-    composition = (
-    loans
-    .groupby(["regime", "pd_decile"], as_index=False)
-    .size()
-)
-
-    composition["share"] = (
-    composition
-    .groupby("regime")["size"]
-    .transform(lambda x: x / x.sum())
-)
-
-    # -------------------------------------------------
-    # PANEL B: Conditional default rates
-    # -------------------------------------------------
-    default_by_risk = (
-        loans
-        .groupby(["regime", "pd_decile"])["default"]
-        .mean()
-        .reset_index()
-    )
+    deciles = pd_decile_table(cube, q=10)
+    composition = deciles[["regime", "pd_decile", "size", "share"]]
+    default_by_risk = deciles[["regime", "pd_decile", "default"]]
 
     # -------------------------------------------------
     # Plot (2-panel hero figure)
@@ -136,5 +87,15 @@ def main():
     plt.close()
 
 
+def main(pipeline=None):
+    # -------------------------------------------------
+    # Load data with logistic regression PDs
+    # -------------------------------------------------
+    if pipeline is None:
+        pipeline = build_pipeline()
+
+    plot_selection_vs_risk(pipeline.get("cube"))
+
+
 if __name__ == "__main__":
     main()
@@ -2,11 +2,8 @@ from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from src.config.paths import RAW_DATA
-from src.data.load import load_lendingclub, load_fred_macro
-from src.data.clean import clean_lendingclub
-from src.data.merge_macro import merge_loans_with_macro
-from src.regimes.regime_labels import assign_macro_regime
+from src.pipeline.stages import build_pipeline
+from src.reporting.cube import monthly_counts, monthly_default_rate
 
 from src.reporting.style import set_plot_style
 from src.reporting.save import save_figure
@@ -18,15 +15,10 @@ OUTPUT_DIR = Path("reports/figures")
 # ==================================================
 # FIGURE 1 — Train / Test timeline (UNCHANGED)
 # ==================================================
-def plot_train_test_timeline(loans: pd.DataFrame):
+def plot_train_test_timeline(cube: pd.DataFrame):
     fig, ax = plt.subplots()
 
-    counts = (
-        loans
-        .set_index("_issue_date_plot")
-        .resample("ME")
-        .size()
-    )
+    counts = monthly_counts(cube)
 
     ax.plot(
         counts.index,
@@ -94,25 +86,10 @@ def plot_macro_regimes(macro: pd.DataFrame):
 # ==================================================
 # FIGURE 3 — Default intensity heatmap (FINAL)
 # ==================================================
-def plot_default_rate_by_regime(loans: pd.DataFrame):
+def plot_default_rate_by_regime(cube: pd.DataFrame):
     fig, ax = plt.subplots(figsize=(11, 4))
 
-    plot_df = loans.dropna(subset=["_issue_date_plot"]).copy()
-
-    heatmap_data = (
-        plot_df
-        .set_index("_issue_date_plot")
-        .groupby("regime")
-        .resample("ME")["default"]
-        .mean()
-        .reset_index()
-    )
-
-    pivot = heatmap_data.pivot(
-        index="regime",
-        columns="_issue_date_plot",
-        values="default"
-    )
+    pivot = monthly_default_rate(cube)
 
     im = ax.imshow(
         pivot.values,
@@ -146,30 +123,19 @@ def plot_default_rate_by_regime(loans: pd.DataFrame):
 # ==================================================
 # MAIN
 # ==================================================
-def main():
+def main(pipeline=None):
     set_plot_style()
 
-    # Load & prepare data
-    loans_raw = load_lendingclub(RAW_DATA / "lendingclub.csv")
-    loans_clean = clean_lendingclub(loans_raw)
-
-    macro = load_fred_macro(RAW_DATA / "fred_macro.csv")
-    loans_macro = merge_loans_with_macro(loans_clean, macro)
-    loans_macro = assign_macro_regime(loans_macro, unemployment_threshold=6.0)
-
-    # --------------------------------------------------
-    # Canonical plotting-only issue date (NO GUESSING)
-    # --------------------------------------------------
-    loans_macro["_issue_date_plot"] = pd.to_datetime(
-        loans_macro["issue_d"],
-        format="%b-%Y",
-        errors="coerce"
-    )
+    # Load & prepare data (shared pipeline stages)
+    if pipeline is None:
+        pipeline = build_pipeline(unemployment_threshold=6.0)
+    cube = pipeline.get("cube")
+    macro = pipeline.get("macro")
 
     # Generate figures
-    plot_train_test_timeline(loans_macro)
+    plot_train_test_timeline(cube)
     plot_macro_regimes(macro)
-    plot_default_rate_by_regime(loans_macro)
+    plot_default_rate_by_regime(cube)
 
 
 if __name__ == "__main__":
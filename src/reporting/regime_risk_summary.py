@@ -1,73 +1,49 @@
-import pandas as pd
-import numpy as np
+from src.models.bootstrap import N_BOOT, GroupMeanRatio, bootstrap_ci, strata_codes
+from src.pipeline.stages import build_pipeline
+from src.reporting.cube import NO_PD, regime_summary
 
-from src.config.paths import RAW_DATA
-from src.data.load import load_lendingclub, load_fred_macro
-from src.data.clean import clean_lendingclub
-from src.data.merge_macro import merge_loans_with_macro
-from src.regimes.regime_labels import assign_macro_regime
-from src.features.build_features import build_features
-from src.models.baseline_pd import train_logistic_pd
 
-
-def main():
+def main(pipeline=None, n_boot: int = N_BOOT):
     print("\nSTEP 10.1 — Regime Risk Summary\n")
 
     # -------------------------------------------------
-    # Load & prepare data (same logic as Figure 5)
+    # Report cube with baseline PDs (shared pipeline
+    # stage, same as Figures 4 and 5)
     # -------------------------------------------------
-    loans = load_lendingclub(RAW_DATA / "lendingclub.csv")
-    loans = clean_lendingclub(loans)
-
-    macro = load_fred_macro(RAW_DATA / "fred_macro.csv")
-    loans = merge_loans_with_macro(loans, macro)
-    loans = assign_macro_regime(loans)
-
-    # -------------------------------------------------
-    # Build features and clean NaNs
-    # -------------------------------------------------
-    X, y = build_features(loans)
-    mask = X.notnull().all(axis=1)
-
-    X_clean = X.loc[mask]
-    y_clean = y.loc[mask]
-    loans_clean = loans.loc[mask].copy()
-
-    # -------------------------------------------------
-    # Train model and predict PDs
-    # -------------------------------------------------
-    model = train_logistic_pd(X_clean, y_clean)
-    loans_clean["pd_hat"] = model.predict_proba(X_clean)[:, 1]
+    if pipeline is None:
+        pipeline = build_pipeline()
+    cube = pipeline.get("cube")
 
     # -------------------------------------------------
     # Regime-level risk summary
     # -------------------------------------------------
-    summary = (
-        loans_clean
-        .groupby("regime")
-        .apply(
-            lambda x: pd.Series({
-                "Mean PD": x["pd_hat"].mean(),
-                "95% PD (Tail Risk)": np.percentile(x["pd_hat"], 95),
-                "Observed Default Rate": x["default"].mean(),
-                "Sample Size": len(x)
-            })
-        )
-        .round(4)
-    )
+    summary = regime_summary(cube, tail=0.95).round(4)
 
     print(summary)
 
     # -------------------------------------------------
-    # Relative risk increase
+    # Relative risk increase, with a bootstrap interval
+    # over loans (resampled within regime, PDs reused);
+    # replicates redraw loan counts per cube cell
     # -------------------------------------------------
-    rel_increase = (
-        summary.loc["Stress", "Mean PD"]
-        / summary.loc["Expansion", "Mean PD"]
-        - 1
-    ) * 100
+    cells = cube[cube["pd_bucket"] != NO_PD]
+    rel_increase = bootstrap_ci(
+        {"rel": GroupMeanRatio(cells["pd_sum"] / cells["n"], cells["regime"], "Stress", "Expansion")},
+        strata=strata_codes(cells["regime"]),
+        sizes=cells["n"].to_numpy(),
+        n_boot=n_boot,
+    ).loc["rel"] * 100
 
-    print(f"\nRelative Mean PD Increase (Stress vs Expansion): {rel_increase:.2f}%")
+    line = (
+        "\nRelative Mean PD Increase (Stress vs Expansion): "
+        f"{rel_increase['estimate']:.2f}%"
+    )
+    if n_boot:
+        line += (
+            f" (95% CI {rel_increase['ci_low']:.2f}% to {rel_increase['ci_high']:.2f}%, "
+            f"{n_boot} bootstrap replicates)"
+        )
+    print(line)
 
 
 if __name__ == "__main__":
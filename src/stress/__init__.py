@@ -1,4 +1,10 @@
 """
-Stress testing is handled via regime-conditioned analysis.
-Explicit stress scenarios may be added here in future extensions.
+Explicit macro stress scenarios and portfolio loss distributions.
+
+scenarios.py builds unemployment paths (baseline / adverse / severely
+adverse, simulated, or from a CSV); engine.py relabels regimes per
+scenario month and rescores a portfolio with the regime-aware PD model
+across all scenarios at once. loss_simulation.py draws correlated
+defaults (one-factor Vasicek, regime-specific factor) for EL, VaR and
+expected shortfall.
 """
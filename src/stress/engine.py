@@ -0,0 +1,184 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+
+from src.data.cache import load_loan_panel
+from src.data.split import time_based_split
+from src.features.build_features import build_features
+from src.models.regime_pd import RegimeInteractionPD
+from src.models.registry import align_features, load_latest_model
+from src.regimes.regime_labels import REGIME_LABELS, label_regime, regime_rule
+from src.stress.scenarios import load_scenarios, simulate_scenarios, standard_scenarios
+
+
+PD_QUANTILES = [0.5, 0.9, 0.99]
+
+# Portfolio x scenario PD columns held at once
+BLOCK_SCENARIOS = 64
+
+
+def regime_mix(
+    paths: pd.DataFrame,
+    regimes: Sequence[str],
+    unemployment_threshold: float = 6.0
+) -> pd.DataFrame:
+    """
+    Share of horizon months each scenario spends in each regime.
+
+    Every scenario month is labelled with the same rule as the panel
+    (label_regime on the S x H path table, never per loan). Months a
+    scenario does not cover (NaN) are left out of its shares.
+    """
+    labels = label_regime(paths.stack().dropna(), unemployment_threshold)
+    share = (
+        pd.crosstab(labels.index.get_level_values("scenario"), labels, normalize="index")
+        .reindex(index=paths.index, columns=list(regimes), fill_value=0.0)
+    )
+    share.columns.name = "regime"
+    return share
+
+
+def regime_pd_matrix(model: RegimeInteractionPD, X: pd.DataFrame) -> np.ndarray:
+    """
+    PD of every loan under every regime (n x R, columns in model.regimes_).
+
+    The regime-aware model only distinguishes regimes through per-regime
+    coefficients, so these R columns are all a scenario can produce.
+    """
+    coef, intercept, _ = model.regime_coefficients()
+    X = np.asarray(X[model.feature_names_in_], dtype=np.float64)
+    return expit(X @ coef.T + intercept)
+
+
+def run_scenarios(
+    model: RegimeInteractionPD,
+    X: pd.DataFrame,
+    paths: pd.DataFrame,
+    unemployment_threshold: float = 6.0,
+    quantiles: Sequence[float] = PD_QUANTILES,
+    block: int = BLOCK_SCENARIOS
+) -> pd.DataFrame:
+    """
+    Rescore a portfolio under unemployment scenarios.
+
+    A loan's horizon PD under a scenario is its regime PDs weighted by
+    the share of scenario months spent in each regime. The portfolio is
+    scored once per regime (n x R); the portfolio x scenario PD matrix
+    is then that n x R matrix times the R x S regime mix, expected
+    defaults are its column sums, and PD quantiles are read from
+    blocks of columns. Scenarios with the same regime mix share one
+    column, so thousands of scenarios reduce to at most a few dozen
+    distinct columns.
+
+    Scenario months are labelled with the Stress/Expansion threshold
+    rule, so the model must be fit on those labels.
+
+    Parameters
+    ----------
+    model : RegimeInteractionPD
+        Fitted regime-aware PD model (Stress/Expansion regimes)
+    X : pd.DataFrame
+        Portfolio features (imputed, model columns)
+    paths : pd.DataFrame
+        Unemployment paths, one row per scenario, one column per month
+    unemployment_threshold : float
+        Regime threshold, as for the panel
+    quantiles : sequence of float
+        PD quantiles across loans to report
+    block : int
+        Distinct scenario columns materialized at once
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per scenario: peak unemployment, share of months per
+        regime, expected defaults, expected default rate and PD
+        quantiles
+    """
+    if not set(model.regimes_) <= set(REGIME_LABELS):
+        raise ValueError(
+            f"Scenarios are labelled {REGIME_LABELS}, but the model was fit on "
+            f"regimes {model.regimes_}"
+        )
+    mix = regime_mix(paths, model.regimes_, unemployment_threshold)
+    pd_by_regime = regime_pd_matrix(model, X)
+
+    expected = mix.to_numpy() @ pd_by_regime.sum(axis=0)
+
+    unique_mix, inverse = np.unique(mix.to_numpy(), axis=0, return_inverse=True)
+    pd_quantiles = np.empty((len(unique_mix), len(quantiles)))
+    for start in range(0, len(unique_mix), block):
+        scenario_pd = pd_by_regime @ unique_mix[start:start + block].T
+        pd_quantiles[start:start + block] = np.quantile(scenario_pd, quantiles, axis=0).T
+
+    result = pd.DataFrame({
+        "peak_unemployment": paths.max(axis=1),
+        **{f"share_{r}": mix[r] for r in mix.columns},
+        "expected_defaults": expected,
+        "expected_default_rate": expected / len(X),
+    }, index=paths.index)
+    for j, q in enumerate(quantiles):
+        result[f"pd_p{round(q * 100)}"] = pd_quantiles[inverse.ravel(), j]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rescore the test-period portfolio under unemployment scenarios."
+    )
+    parser.add_argument("--scenarios", type=Path, help="Long CSV: scenario, month, unemployment_rate")
+    parser.add_argument("--n-random", type=int, default=1000)
+    parser.add_argument("--unemployment-threshold", type=float, default=6.0)
+    parser.add_argument("--train-end-date", default="2016-12-31")
+    parser.add_argument(
+        "--output", type=Path, default=Path("reports/tables/stress_scenarios.csv")
+    )
+    args = parser.parse_args()
+
+    panel = load_loan_panel(unemployment_threshold=args.unemployment_threshold)
+    _, portfolio = time_based_split(panel, train_end_date=args.train_end_date)
+
+    # Scenario months are labelled with --unemployment-threshold, so only
+    # a model fit on panel regimes from the same rule may be used
+    rule = regime_rule(args.unemployment_threshold)
+    try:
+        artifact = load_latest_model("regime_pd", regime_rule=rule)
+    except FileNotFoundError as err:
+        raise FileNotFoundError(
+            f"{err}; fit one first (python -m src.pipeline.reports model_auc "
+            f"--unemployment-threshold {args.unemployment_threshold:g})"
+        ) from err
+    X, _ = build_features(portfolio, artifact.schema)
+    X = align_features(X, artifact)
+
+    # Paths start from the last unemployment rate seen by the panel
+    start_rate = float(panel.sort_values("issue_month")["unemployment_rate"].dropna().iloc[-1])
+    paths = [standard_scenarios(start_rate)]
+    if args.scenarios is not None:
+        paths.append(load_scenarios(args.scenarios))
+    if args.n_random:
+        paths.append(simulate_scenarios(start_rate, args.n_random))
+    paths = pd.concat(paths)
+
+    start = time.perf_counter()
+    results = run_scenarios(artifact.model, X, paths, args.unemployment_threshold)
+    seconds = time.perf_counter() - start
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(args.output)
+
+    named = results.loc[[s for s in results.index if not str(s).startswith("sim_")]]
+    with pd.option_context("display.width", 160):
+        print(named.round(4).to_string())
+    print(f"\n{len(results)} scenarios x {len(X):,} loans in {seconds:.2f}s "
+          f"(start unemployment {start_rate:.1f}%)")
+    print(f"Saved table: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Nine quarters, as in supervisory stress tests
+HORIZON_MONTHS = 27
+
+# Peak rise in the unemployment rate (percentage points) per scenario
+SCENARIO_SHOCKS = {
+    "baseline": 0.0,
+    "adverse": 3.0,
+    "severely_adverse": 5.0,
+}
+
+# Months until the shock peaks; the rate then stays at the peak
+PEAK_MONTH = 18
+
+
+def standard_scenarios(
+    start_rate: float,
+    horizon: int = HORIZON_MONTHS,
+    shocks: Dict[str, float] = SCENARIO_SHOCKS,
+    peak_month: int = PEAK_MONTH
+) -> pd.DataFrame:
+    """
+    Baseline / adverse / severely adverse unemployment paths.
+
+    Each path rises linearly from start_rate by its shock over
+    peak_month months and then holds.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per scenario, columns = months 1..horizon
+    """
+    ramp = np.minimum(np.arange(1, horizon + 1) / peak_month, 1.0)
+    return pd.DataFrame(
+        {name: start_rate + shock * ramp for name, shock in shocks.items()},
+        index=pd.RangeIndex(1, horizon + 1, name="month"),
+    ).T.rename_axis("scenario")
+
+
+def simulate_scenarios(
+    start_rate: float,
+    n_scenarios: int,
+    horizon: int = HORIZON_MONTHS,
+    monthly_vol: float = 0.25,
+    persistence: float = 0.9,
+    seed: Optional[int] = 0
+) -> pd.DataFrame:
+    """
+    Random unemployment paths with persistent monthly changes (AR(1)
+    in the month-on-month change), floored at 2%.
+
+    Same layout as standard_scenarios, scenarios named sim_0000, ...
+    """
+    rng = np.random.default_rng(seed)
+    shocks = rng.normal(0.0, monthly_vol, size=(n_scenarios, horizon))
+
+    changes = np.empty_like(shocks)
+    changes[:, 0] = shocks[:, 0]
+    for t in range(1, horizon):
+        changes[:, t] = persistence * changes[:, t - 1] + shocks[:, t]
+
+    paths = np.maximum(start_rate + np.cumsum(changes, axis=1), 2.0)
+    return pd.DataFrame(
+        paths,
+        index=pd.Index([f"sim_{i:04d}" for i in range(n_scenarios)], name="scenario"),
+        columns=pd.RangeIndex(1, horizon + 1, name="month"),
+    )
+
+
+def load_scenarios(path: Path) -> pd.DataFrame:
+    """
+    User-defined paths from a long CSV with columns scenario, month
+    (1, 2, ...) and unemployment_rate.
+
+    Returns the same wide layout as standard_scenarios; every scenario
+    must cover the same months.
+    """
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+
+    missing = {"scenario", "month", "unemployment_rate"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Scenario file missing columns {sorted(missing)}: {path}")
+
+    paths = df.pivot(index="scenario", columns="month", values="unemployment_rate")
+    if paths.isna().any().any():
+        raise ValueError(f"Scenarios in {path} do not all cover the same months")
+    return paths.sort_index(axis=1)